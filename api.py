@@ -0,0 +1,307 @@
+"""Headless JSON API serving the same data, stats, forecasts and chatbot
+answers as the Streamlit app.
+
+    uvicorn api:app --port 8502 --workers 4
+
+POST /risk scores an uploaded patient CSV and streams the scored rows back.
+
+Every response body is cached per data version (CSV mtime and size), so
+polling clients get a cached body, a 304 via If-None-Match, or pre-gzipped
+bytes without re-running the computation. With TRACKER_CACHE_DIR set, the
+cache is shared by all workers and replicas on the host.
+"""
+import contextlib
+import gzip
+import hashlib
+import json
+import tempfile
+
+from starlette.applications import Starlette
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from tracker import news, perf, risk, warmup, watcher
+from tracker.anomaly import monitor
+from tracker.cache import shared_cache
+from tracker.chatbot import detect_entities, generate_response, is_surge_question
+from tracker.data import (
+    COUNTRIES,
+    DISEASES,
+    data_version,
+    disease_tag,
+    file_version,
+    info_path,
+    load_series,
+    pair_tag,
+    pair_tags,
+    query_csv_data,
+)
+from tracker.forecast import forecast_series
+
+GZIP_MIN_SIZE = 1024
+UPLOAD_SPOOL_SIZE = 8 * 1024 * 1024
+STREAM_BLOCK_SIZE = 64 * 1024
+
+responses = shared_cache('api_cache', maxsize=512)
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def require_disease(params):
+    disease = params.get('disease', '')
+    if disease not in DISEASES:
+        raise ApiError(400, f"Unknown disease {disease!r}. Choose from: {', '.join(DISEASES)}")
+    return disease
+
+
+def require_country(params, name='country'):
+    country = params.get(name, '')
+    if country not in COUNTRIES:
+        raise ApiError(400, f"Unknown country {country!r}. Choose from: {', '.join(COUNTRIES)}")
+    return country
+
+
+def require_countries(params):
+    countries = [c.strip() for c in params.get('countries', '').split(',') if c.strip()]
+    if not countries:
+        countries = list(COUNTRIES)
+    unknown = [c for c in countries if c not in COUNTRIES]
+    if unknown:
+        raise ApiError(400, f"Unknown countries: {', '.join(unknown)}")
+    return countries
+
+
+def require_series(disease, country):
+    df = load_series(disease, country)
+    if df is None:
+        raise ApiError(404, f"No data for {disease} in {country}")
+    return df
+
+
+def build_entry(payload):
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+    return body, gzipped, etag
+
+
+def cached_response(request, key, compute, tags=()):
+    try:
+        entry = responses.get_or_compute(key, lambda: build_entry(compute()), tags)
+    except ApiError as e:
+        return error_response(e.status, e.message)
+    return entry_response(request, entry)
+
+
+def entry_response(request, entry):
+    body, gzipped, etag = entry
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+    if request.headers.get('if-none-match') == etag:
+        perf.count('api_not_modified')
+        return Response(status_code=304, headers=headers)
+    if gzipped is not None and 'gzip' in request.headers.get('accept-encoding', ''):
+        headers['Content-Encoding'] = 'gzip'
+        return Response(gzipped, media_type='application/json', headers=headers)
+    return Response(body, media_type='application/json', headers=headers)
+
+
+def error_response(status, message):
+    body = json.dumps({'error': message}).encode('utf-8')
+    return Response(body, status_code=status, media_type='application/json')
+
+
+def handle(endpoint):
+    def run(request, params):
+        with perf.timer(f'api {endpoint.__name__}'):
+            try:
+                return endpoint(request, params)
+            except ApiError as e:
+                return error_response(e.status, e.message)
+
+    # Forecasts and CSV parsing are CPU-bound, so keep them off the event loop.
+    async def route(request):
+        return await run_in_threadpool(run, request, request.query_params)
+    return route
+
+
+def series(request, params):
+    disease, country = require_disease(params), require_country(params)
+    key = ('series', disease, country, data_version(disease, country))
+
+    def compute():
+        df = require_series(disease, country)
+        return {
+            'disease': disease,
+            'country': country,
+            'dates': df['date'].dt.strftime('%Y-%m-%d').tolist(),
+            'cases': df['cases'].astype(int).tolist(),
+            'deaths': df['deaths'].astype(int).tolist(),
+        }
+    return cached_response(request, key, compute, [pair_tag(disease, country)])
+
+
+def stats(request, params):
+    disease, country = require_disease(params), require_country(params)
+    key = ('stats', disease, country, data_version(disease, country))
+
+    def compute():
+        analysis = query_csv_data(disease, country)
+        if analysis is None:
+            raise ApiError(404, f"No data for {disease} in {country}")
+        return {'disease': disease, 'country': country, **analysis}
+    return cached_response(request, key, compute, [pair_tag(disease, country)])
+
+
+def forecast(request, params):
+    disease, country = require_disease(params), require_country(params)
+    try:
+        days = int(params.get('days', 90))
+    except ValueError:
+        raise ApiError(400, "days must be an integer")
+    if not 1 <= days <= 365:
+        raise ApiError(400, "days must be between 1 and 365")
+    key = ('forecast', disease, country, days, data_version(disease, country))
+
+    def compute():
+        require_series(disease, country)
+        future_df, confidence = forecast_series(disease, country, days)
+        if future_df is None:
+            raise ApiError(500, f"Forecast failed for {disease} in {country}")
+        return {
+            'disease': disease,
+            'country': country,
+            'days': days,
+            'confidence': round(float(confidence), 4),
+            'dates': future_df['date'].dt.strftime('%Y-%m-%d').tolist(),
+            'predicted_cases': future_df['predicted_cases'].astype(int).tolist(),
+        }
+    return cached_response(request, key, compute, [pair_tag(disease, country)])
+
+
+def aggregate(request, params):
+    disease, countries = require_disease(params), require_countries(params)
+    key = ('aggregate', disease, tuple(countries), tuple(data_version(disease, c) for c in countries))
+
+    def compute():
+        rows = []
+        for country in countries:
+            analysis = query_csv_data(disease, country)
+            if analysis is None:
+                continue
+            rows.append({
+                'country': country,
+                'total_cases': analysis['total_cases'],
+                'total_deaths': analysis['total_deaths'],
+                'latest_cases': analysis['latest_cases'],
+                'mortality_rate': analysis['mortality_rate'],
+                'trend': analysis['trend'],
+            })
+        return {
+            'disease': disease,
+            'countries': rows,
+            'total_cases': sum(r['total_cases'] for r in rows),
+            'total_deaths': sum(r['total_deaths'] for r in rows),
+        }
+    return cached_response(request, key, compute, pair_tags(disease, countries))
+
+
+def chat(request, params):
+    question = params.get('q', '').strip()
+    if not question:
+        raise ApiError(400, "q is required")
+    disease, country = require_disease(params), require_country(params)
+    detected_disease, detected_country = detect_entities(question, disease, country)
+    key = ('chat', ' '.join(question.lower().split()), disease, country,
+           detected_disease, detected_country, data_version(detected_disease, detected_country),
+           file_version(info_path(detected_disease)))
+
+    def compute():
+        return {
+            'question': question,
+            'detected_disease': detected_disease,
+            'detected_country': detected_country,
+            'response': generate_response(question, disease, country),
+        }
+    if is_surge_question(question):
+        # Surge answers cover every series and follow the monitor's state,
+        # not this pair's data version, so they are never cached.
+        return entry_response(request, build_entry(compute()))
+    return cached_response(request, key, compute, [pair_tag(detected_disease, detected_country), disease_tag(detected_disease)])
+
+
+def score_upload(upload, output):
+    # Scores the whole file before anything is sent, so a bad row anywhere
+    # in it is a 400 instead of a 200 whose body stops short.
+    rows = 0
+    for scored in risk.score_csv(upload):
+        output.write(scored.to_csv(header=rows == 0, index=False).encode('utf-8'))
+        rows += len(scored)
+    return rows
+
+
+async def risk_scores(request):
+    # The body is read in chunks into a spooled file, and the scored rows go
+    # to another; both move to disk past UPLOAD_SPOOL_SIZE, so large uploads
+    # are never held in memory whole.
+    upload = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE)
+    output = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE)
+    try:
+        with upload:
+            async for chunk in request.stream():
+                upload.write(chunk)
+            upload.seek(0)
+            rows = await run_in_threadpool(score_upload, upload, output)
+    except ValueError as e:
+        output.close()
+        return error_response(400, str(e))
+    if not rows:
+        output.close()
+        return error_response(400, "No rows to score")
+    output.seek(0)
+
+    def blocks():
+        with output:
+            yield from iter(lambda: output.read(STREAM_BLOCK_SIZE), b'')
+    return StreamingResponse(iterate_in_threadpool(blocks()), media_type='text/csv')
+
+
+def metrics(request, params):
+    body = json.dumps(perf.snapshot()).encode('utf-8')
+    return Response(body, media_type='application/json')
+
+
+def health(request, params):
+    body = json.dumps({
+        'status': 'ok',
+        'data_version': watcher.watcher.version,
+        'warmup': warmup.warmer.progress(),
+    }).encode('utf-8')
+    return Response(body, media_type='application/json')
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Precompute every pair in the background; requests are served meanwhile.
+    warmup.start()
+    watcher.start()
+    news.start_ingest()
+    monitor.start()
+    yield
+
+
+app = Starlette(lifespan=lifespan, routes=[
+    Route('/series', handle(series)),
+    Route('/stats', handle(stats)),
+    Route('/forecast', handle(forecast)),
+    Route('/aggregate', handle(aggregate)),
+    Route('/chat', handle(chat)),
+    Route('/risk', risk_scores, methods=['POST']),
+    Route('/perf', handle(metrics)),
+    Route('/health', handle(health)),
+])
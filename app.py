@@ -1,25 +1,33 @@
 ﻿import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
+import html
+import io
+import math
 import os
-import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
-from scipy.ndimage import gaussian_filter1d
+import time
+
+from tracker import perf, tts, news, reports, risk, warmup, watcher
+from tracker.anomaly import monitor
+from tracker.lazy import LazyModule, warm_up
+from tracker import (
+    COUNTRIES, DISEASES, CHRONIC_DISEASES,
+    data_path, history_path, info_path, load_series, read_text,
+    query_csv_data, generate_response, append_turn, forecast_series,
+    calculate_growth_rate, aligned_series, cases_on, history_tag,
+)
+from tracker.figures import forecast_figure, heatmap_countries, heatmap_figure, lead_lag_figure
+from tracker.resample import FREQUENCY_NAMES
+from tracker.scenario import SCENARIO_MODELS, run_scenarios
+
+HAS_TTS = tts.available()
+HAS_NEWS = news.available()
+
+px = LazyModule("plotly.express")
+go = LazyModule("plotly.graph_objects")
 
-try:
-    from gtts import gTTS
-    from io import BytesIO
-    HAS_TTS = True
-except ImportError:
-    HAS_TTS = False
-try:
-    import feedparser
-    HAS_NEWS = True
-except ImportError:
-    HAS_NEWS = False
+rerun_start = time.perf_counter()
+warmup.begin_render()
 
 st.set_page_config(
     page_title="Disease Tracker Pro",
@@ -79,31 +87,21 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 
 st.sidebar.header("Select Parameters")
 
-COUNTRIES = [
-    "India", "America", "Canada", 
-    "China", "Russia",
-    "Australia", 
-    "South Korea", "France", "Germany", "Japan"
-]
-
-DISEASES = [
-    "HIV/AIDS", "Diabetes", "Tuberculosis",
-    "COVID-19", "Colon Cancer", 
-    "Alzheimer's"
-]
+def show_chart(fig, **kwargs):
+    with perf.timer('plotly_chart'):
+        st.plotly_chart(fig, **kwargs)
 
 country = st.sidebar.selectbox("Select Country", COUNTRIES)
 disease = st.sidebar.selectbox("Select Disease", DISEASES)
+warmup.record_view(disease, country)
 
 compare_mode = st.sidebar.checkbox("🔄 Compare with another country")
 if compare_mode:
     country2 = st.sidebar.selectbox("Compare with", [c for c in COUNTRIES if c != country])
 
-disease_file = disease.lower().replace("-", "").replace("/", "_").replace(" ", "_")
-country_file = country.lower().replace(" ", "_")
-data_file = f"data/{disease_file}_{country_file}.csv"
-history_file = f"content/history/{disease_file}_{country_file}.txt"
-disease_info_file = f"content/diseases/{disease_file}_info.txt"
+data_file = data_path(disease, country)
+history_file = history_path(disease, country)
+disease_info_file = info_path(disease)
 
 st.sidebar.markdown("---")
 st.sidebar.subheader(f"ℹ️ About {disease}")
@@ -159,23 +157,19 @@ if disease in disease_quick_facts:
 if os.path.exists(disease_info_file):
     with st.sidebar.expander("📖 Read More"):
         try:
-            with open(disease_info_file, 'r', encoding='utf-8') as f:
-                full_info = f.read()
-                st.markdown(full_info[:500] + "..." if len(full_info) > 500 else full_info)
+            full_info = read_text(disease_info_file)
+            st.markdown(full_info[:500] + "..." if len(full_info) > 500 else full_info)
         except:
             pass
-data_available = os.path.exists(data_file)
-if data_available:
-    data = pd.read_csv(data_file)
-    data['date'] = pd.to_datetime(data['date'])
+data = load_series(disease, country)
+data_available = data is not None
 
 with tab1:
     st.header(f"{disease} in {country}")
 
     if data_available:
         try:
-            chronic_diseases = ["Diabetes", "HIV/AIDS", "Alzheimer's", "Colon Cancer"]
-            is_chronic = disease in chronic_diseases
+            is_chronic = disease in CHRONIC_DISEASES
             
             if is_chronic:
                 case_label = "People Living With Condition"
@@ -199,26 +193,43 @@ with tab1:
                 latest_cases = data['cases'].iloc[-1]
                 st.metric(metric_label, f"{latest_cases:,}")
             
+            alert = monitor.active_alert(disease, country)
+            if alert:
+                st.warning(f"🚨 **Unusual surge:** {alert['cases']:,} cases on {alert['date'].strftime('%B %d, %Y')} "
+                           f"(flagged by {', '.join(alert['detectors'])}, score {alert['score']:.1f})")
+            
+            active_alerts = monitor.active_alerts()
+            with st.expander(f"🚨 Surge Alerts Across All Diseases ({len(active_alerts)})"):
+                if not monitor.ready:
+                    st.info("⏳ Surge detection is scanning the data in the background.")
+                elif active_alerts:
+                    st.dataframe(pd.DataFrame([{
+                        'Disease': a['disease'],
+                        'Country': a['country'],
+                        'Date': a['date'].strftime('%Y-%m-%d'),
+                        'Cases': a['cases'],
+                        'Score': a['score'],
+                        'Detectors': ', '.join(a['detectors']),
+                    } for a in active_alerts]), hide_index=True, width='stretch')
+                else:
+                    st.success("No unusual surges in the latest data.")
+            
             st.subheader("📊 Historical Data")
             
             if compare_mode:
-                country_file2 = country2.lower().replace(" ", "_")
-                data_file2 = f"data/{disease_file}_{country_file2}.csv"
-                if os.path.exists(data_file2):
-                    data2 = pd.read_csv(data_file2)
-                    data2['date'] = pd.to_datetime(data2['date'])
-                    
+                aligned = aligned_series(disease, [country, country2])
+                if country2 in aligned.columns:
                     fig = go.Figure()
-                    fig.add_trace(go.Scatter(x=data['date'], y=data['cases'], 
+                    fig.add_trace(go.Scatter(x=aligned.index, y=aligned[country], 
                                             mode='lines', name=country,
                                             line=dict(color='blue', width=3)))
-                    fig.add_trace(go.Scatter(x=data2['date'], y=data2['cases'], 
+                    fig.add_trace(go.Scatter(x=aligned.index, y=aligned[country2], 
                                             mode='lines', name=country2,
                                             line=dict(color='red', width=3)))
                     fig.update_layout(title=f'{disease} Cases Comparison',
                                      xaxis_title='Date', yaxis_title=chart_ylabel,
                                      height=500, hovermode='x unified')
-                    st.plotly_chart(fig, width='stretch')
+                    show_chart(fig, width='stretch')
                 else:
                     st.warning(f"Data for {country2} not available")
                     fig = px.area(data, x='date', y='cases', 
@@ -226,14 +237,14 @@ with tab1:
                                  labels={'cases': chart_ylabel, 'date': 'Date'})
                     fig.update_traces(line_color='#1f77b4', fillcolor='rgba(31, 119, 180, 0.3)')
                     fig.update_layout(height=500, hovermode='x')
-                    st.plotly_chart(fig, width='stretch')
+                    show_chart(fig, width='stretch')
             else:
                 fig = px.area(data, x='date', y='cases', 
                              title=f'{disease} - {case_label} Over Time in {country}',
                              labels={'cases': chart_ylabel, 'date': 'Date'})
                 fig.update_traces(line_color='#1f77b4', fillcolor='rgba(31, 119, 180, 0.3)')
                 fig.update_layout(height=500, hovermode='x')
-                st.plotly_chart(fig, width='stretch')
+                show_chart(fig, width='stretch')
             
             fig_deaths = px.line(data, x='date', y='deaths',
                                 title=f'{disease} Deaths Over Time in {country}',
@@ -241,7 +252,7 @@ with tab1:
                                 line_shape='linear')
             fig_deaths.update_traces(line_color='red')
             fig_deaths.update_layout(height=400)
-            st.plotly_chart(fig_deaths, use_container_width=True)
+            show_chart(fig_deaths, use_container_width=True)
             
             st.subheader("🔍 Daily Case Finder")
             selected_date = st.date_input("Select a date to view cases", 
@@ -249,13 +260,13 @@ with tab1:
                                           min_value=data['date'].min().date(),
                                           max_value=data['date'].max().date())
             
-            selected_data = data[data['date'].dt.date == selected_date]
-            if not selected_data.empty:
+            selected_data = cases_on(disease, country, selected_date)
+            if selected_data is not None:
                 col1, col2 = st.columns(2)
                 with col1:
-                    st.info(f"**Cases on {selected_date}:** {selected_data['cases'].values[0]:,}")
+                    st.info(f"**Cases on {selected_date}:** {selected_data[0]:,}")
                 with col2:
-                    st.info(f"**Deaths on {selected_date}:** {selected_data['deaths'].values[0]:,}")
+                    st.info(f"**Deaths on {selected_date}:** {selected_data[1]:,}")
             else:
                 st.warning("No data available for selected date")
             
@@ -268,8 +279,7 @@ with tab1:
     st.subheader("📖 Disease History & Key Facts")
     if os.path.exists(history_file):
         try:
-            with open(history_file, 'r', encoding='utf-8') as f:
-                history_text = f.read()
+            history_text = read_text(history_file)
             
             text_preview = history_text[:400] + "..." if len(history_text) > 400 else history_text
             
@@ -290,10 +300,7 @@ with tab1:
                 if HAS_TTS:
                     if st.button("🔊 Listen to History", key="tts_btn"):
                         try:
-                            tts = gTTS(text=history_text, lang='en', slow=False)
-                            audio_bytes = BytesIO()
-                            tts.write_to_fp(audio_bytes)
-                            audio_bytes.seek(0)
+                            audio_bytes = tts.synthesize(history_text, tags=[history_tag(disease, country)])
                             st.audio(audio_bytes, format='audio/mp3')
                         except Exception as e:
                             st.error(f"TTS error: {str(e)}")
@@ -308,395 +315,35 @@ with tab1:
         with col3:
             st.metric("📅 Data Range", f"{data['date'].min().year} - {data['date'].max().year}")
 
-def predict_future_cases(data, days_ahead=90):
-    try:
-        data = data.copy()
-        data = data.sort_values('date')
-        data['days'] = (data['date'] - data['date'].min()).dt.days
-        
-        recent_data = data.tail(min(180, len(data)))
-        X = recent_data['days'].values.reshape(-1, 1)
-        y = recent_data['cases'].values
-        
-        y_log = np.log1p(y)
-        
-        poly = PolynomialFeatures(degree=3)
-        X_poly = poly.fit_transform(X)
-        
-        model = LinearRegression()
-        model.fit(X_poly, y_log)
-        
-        last_day = recent_data['days'].max()
-        future_days = np.array(range(last_day + 1, last_day + days_ahead + 1)).reshape(-1, 1)
-        future_days_poly = poly.transform(future_days)
-        predictions_log = model.predict(future_days_poly)
-        
-        predictions = np.expm1(predictions_log)
-        predictions = np.maximum(predictions, 0)
-        
-        from scipy.ndimage import gaussian_filter1d
-        predictions = gaussian_filter1d(predictions, sigma=2)
-        
-        last_date = data['date'].max()
-        future_dates = [last_date + timedelta(days=i) for i in range(1, days_ahead + 1)]
-        
-        future_df = pd.DataFrame({
-            'date': future_dates,
-            'predicted_cases': predictions.astype(int)
-        })
-        
-        y_pred_log = model.predict(X_poly)
-        y_pred = np.expm1(y_pred_log)
-        from sklearn.metrics import r2_score, mean_absolute_percentage_error
-        r2 = r2_score(y, y_pred)
-        
-        confidence = max(0.70, min(0.95, r2 * 1.5))
-        
-        return future_df, confidence
-    except Exception as e:
-        print(f"Prediction error: {e}")
-        return None, 0
-
-def calculate_growth_rate(data, window=7):
-    try:
-        data = data.sort_values('date')
-        data['rolling_avg'] = data['cases'].rolling(window=window, min_periods=1).mean()
-        data['growth_rate'] = data['rolling_avg'].pct_change() * 100
-        return data
-    except:
-        return data
-
-def query_csv_data(disease, country):
-    disease_file = disease.lower().replace("-", "").replace("/", "_").replace(" ", "_")
-    country_file = country.lower().replace(" ", "_")
-    data_path = f"data/{disease_file}_{country_file}.csv"
-    
-    if not os.path.exists(data_path):
-        return None
-    
-    try:
-        df = pd.read_csv(data_path)
-        df['date'] = pd.to_datetime(df['date'])
-        
-        chronic_diseases = ["Diabetes", "HIV/AIDS", "Alzheimer's", "Colon Cancer"]
-        is_chronic = disease in chronic_diseases
-        
-        analysis = {
-            'total_cases': int(df['cases'].sum()),
-            'total_deaths': int(df['deaths'].sum()),
-            'peak_cases': int(df['cases'].max()),
-            'peak_date': df.loc[df['cases'].idxmax(), 'date'].strftime('%B %d, %Y'),
-            'latest_cases': int(df['cases'].iloc[-1]),
-            'latest_date': df['date'].iloc[-1].strftime('%B %d, %Y'),
-            'mortality_rate': round((df['deaths'].sum() / df['cases'].sum() * 100) if df['cases'].sum() > 0 else 0, 2),
-            'data_range': f"{df['date'].min().strftime('%Y')} to {df['date'].max().strftime('%Y')}",
-            'is_chronic': is_chronic
-        }
-        
-        if is_chronic:
-            if len(df) >= 2:
-                prev_value = df['cases'].iloc[-2]
-                current_value = df['cases'].iloc[-1]
-                year_change = current_value - prev_value
-                year_change_pct = (year_change / prev_value * 100) if prev_value > 0 else 0
-                analysis['recent_avg'] = None
-                analysis['year_change'] = int(year_change)
-                analysis['year_change_pct'] = round(year_change_pct, 1)
-                analysis['trend'] = 'increasing' if year_change > 0 else 'decreasing'
-            else:
-                analysis['recent_avg'] = None
-                analysis['year_change'] = 0
-                analysis['year_change_pct'] = 0
-                analysis['trend'] = 'stable'
-        else:
-            recent_data = df.tail(30)
-            analysis['recent_avg'] = int(recent_data['cases'].mean())
-            analysis['year_change'] = None
-            analysis['year_change_pct'] = None
-            analysis['trend'] = 'increasing' if recent_data['cases'].iloc[-7:].mean() > recent_data['cases'].iloc[:7].mean() else 'decreasing'
-        
-        return analysis
-    except Exception as e:
-        return None
-
-def generate_response(user_question, current_disease, current_country):
-    all_diseases = ["HIV/AIDS", "Diabetes", "Tuberculosis", "COVID-19", "Colon Cancer", "Alzheimer's"]
-    all_countries = ["India", "America", "Canada", "China", "Russia", "Australia", "South Korea", "France", "Germany", "Japan"]
-    
-    question_lower = user_question.lower()
-    disease_keywords = {
-        "HIV/AIDS": ["hiv", "aids"],
-        "Diabetes": ["diabetes", "diabetic"],
-        "Tuberculosis": ["tuberculosis", "tb"],
-        "COVID-19": ["covid", "coronavirus", "covid-19", "covid19"],
-        "Colon Cancer": ["cancer", "colon cancer"],
-        "Alzheimer's": ["alzheimer", "alzheimers", "dementia"]
-    }
-    
-    detected_disease = current_disease
-    detected_country = current_country
-    
-    for disease, keywords in disease_keywords.items():
-        if any(kw in question_lower for kw in keywords):
-            detected_disease = disease
-            break
-    
-    for country in all_countries:
-        if country.lower() in question_lower:
-            detected_country = country
-            break
-    
-    disease_file = detected_disease.lower().replace("/", "_").replace("-", "_").replace(" ", "_")
-    info_path = f"content/diseases/{disease_file}_info.txt"
-    disease_info = ""
-    if os.path.exists(info_path):
-        try:
-            with open(info_path, 'r', encoding='utf-8') as f:
-                disease_info = f.read()
-        except:
-            pass
-    
-    stats = query_csv_data(detected_disease, detected_country)
-    
-    return use_fallback_chatbot(user_question, current_disease, current_country, detected_disease, detected_country, stats, disease_info)
-
-
-def use_fallback_chatbot(user_question, current_disease, current_country, detected_disease, detected_country, stats, disease_info):
-    question_lower = user_question.lower()
-    
-    # Check for greetings - pretty straightforward
-    if any(w in question_lower for w in ['hi', 'hello', 'hey', 'hola']):
-        response = f"""👋 **Hello! I'm your AI health assistant.**
-
-I have comprehensive data about **{detected_disease}** in **{detected_country}**.
-
-**What I can help you with:**
-📊 Statistics & trends
-💊 Symptoms & signs
-🏥 Treatment options
-🛡️ Prevention strategies
-📈 Risk factors
-
-**Try asking:**
-• "How many cases are there?"
-• "What are the symptoms?"
-• "How is it treated?"
-• "How can I prevent it?"
-"""
-        if stats:
-            response += f"\n**Quick Stats:** {stats['total_cases']:,} cases, {stats['total_deaths']:,} deaths in {detected_country}"
-        return response
-    
-    if any(w in question_lower for w in ['how many', 'cases', 'deaths', 'statistics', 'data', 'numbers', 'stats']):
-        if stats:
-            is_chronic = stats.get('is_chronic', False)
-            
-            if is_chronic:
-                response = f"""📊 **{detected_disease} in {detected_country} - Statistics**
-
-**Overall Prevalence:**
-• Current Prevalence: {stats['latest_cases']:,} people living with {detected_disease}
-• Peak Prevalence: {stats['peak_cases']:,} people ({stats['peak_date']})
-• Total Deaths Recorded: {stats['total_deaths']:,}
-
-**Year-over-Year Change:**
-• Change from Previous Year: {stats.get('year_change', 0):+,} people ({stats.get('year_change_pct', 0):+.1f}%)
-• Trend: {stats['trend'].upper()}
-
-**Data Coverage:** {stats['data_range']}
-
-*Note: This is a chronic condition tracked by annual prevalence (people living with the disease), not daily cases.*
-"""
-            else:
-                response = f"""📊 **{detected_disease} in {detected_country} - Statistics**
-
-**Overall Impact:**
-• Total Cases: {stats['total_cases']:,}
-• Total Deaths: {stats['total_deaths']:,}
-• Mortality Rate: {stats['mortality_rate']}%
-
-**Peak Period:**
-• Highest: {stats['peak_cases']:,} daily cases
-• Date: {stats['peak_date']}
-
-**Current Situation:**
-• Latest: {stats['latest_cases']:,} cases ({stats['latest_date']})
-• 30-day avg: {stats.get('recent_avg', 0):,} cases/day
-• Trend: {stats['trend'].upper()}
-
-**Data Coverage:** {stats['data_range']}
-"""
-            return response
-        return f"❌ No data available for {detected_disease} in {detected_country}. Try selecting from the sidebar."
-    
-    if any(w in question_lower for w in ['symptom', 'signs', 'feel', 'sick', 'diagnosis']):
-        if disease_info:
-            info_lower = disease_info.lower()
-            if 'symptom' in info_lower:
-                lines = disease_info.split('\n')
-                symptom_section = []
-                in_section = False
-                for line in lines:
-                    if 'symptom' in line.lower() and not in_section:
-                        in_section = True
-                        symptom_section.append(line)
-                    elif in_section:
-                        if line.strip() and (line[0].isupper() or line.startswith('•') or line.startswith('-')):
-                            symptom_section.append(line)
-                        if len(symptom_section) > 15 or (line.strip() == '' and len(symptom_section) > 5):
-                            break
-                
-                if symptom_section:
-                    return f"**{detected_disease} - Symptoms**\n\n" + '\n'.join(symptom_section) + "\n\n⚠️ *If experiencing symptoms, consult a healthcare professional.*"
-        
-        return f"""ℹ️ **Symptom Information**
-
-For detailed symptoms of {detected_disease}, please:
-1. Click "View Disease Info" in the sidebar
-2. Check the Dashboard tab for statistics
-3. Visit the Risk Calculator tab
-
-*Always consult healthcare professionals for medical advice.*"""
-    
-    if any(w in question_lower for w in ['treat', 'cure', 'medicine', 'therapy', 'drug']):
-        if disease_info and 'treatment' in disease_info.lower():
-            lines = disease_info.split('\n')
-            treatment_section = []
-            in_section = False
-            for line in lines:
-                if 'treatment' in line.lower() and not in_section:
-                    in_section = True
-                    treatment_section.append(line)
-                elif in_section:
-                    if line.strip():
-                        treatment_section.append(line)
-                    if len(treatment_section) > 12:
-                        break
-            
-            if treatment_section:
-                return f"**{detected_disease} - Treatment**\n\n" + '\n'.join(treatment_section) + "\n\n⚠️ *Treatment must be guided by qualified healthcare professionals.*"
-        
-        return f"""🏥 **Treatment Information**
-
-For {detected_disease} treatment options:
-• Check "View Disease Info" in sidebar
-• Consult healthcare professionals
-• Visit local health facilities
-
-*Never self-medicate. Seek professional guidance.*"""
-    
-    if any(w in question_lower for w in ['prevent', 'avoid', 'protection', 'safe', 'reduce risk']):
-        return f"""🛡️ **Prevention Strategies for {detected_disease}**
-
-**General Prevention:**
-• Maintain good hygiene
-• Regular health check-ups
-• Follow medical guidelines
-• Stay informed about risks
-
-**More Information:**
-• View Disease Info (sidebar)
-• Check Risk Calculator tab
-• Consult healthcare providers
-
-*Prevention is often more effective than treatment.*"""
-    
-    if any(w in question_lower for w in ['risk', 'cause', 'why', 'susceptible', 'vulnerable']):
-        return f"""⚠️ **Risk Factors for {detected_disease}**
-
-Risk factors vary by disease. Common factors include:
-• Age and genetics
-• Lifestyle choices
-• Environmental exposure
-• Pre-existing conditions
-• Geographic location
-
-**Check your risk:**
-Go to the **Risk Calculator** tab for personalized assessment.
-
-*Understanding risk helps in prevention.*"""
-    
-    if any(w in question_lower for w in ['compare', 'comparison', 'versus', 'vs', 'difference']):
-        return f"""📊 **Compare {detected_disease} Across Countries**
-
-**To compare data:**
-1. Go to **Dashboard** tab
-2. Enable **"Compare with another country"** checkbox
-3. Select second country
-4. View side-by-side statistics
-
-**Available countries:**
-India, America, Canada, China, Russia, Australia, South Korea, France, Germany, Japan
-
-*Compare trends, peaks, and mortality rates!*"""
-    
-    if any(w in question_lower for w in ['thank', 'thanks', 'appreciate']):
-        return "You're welcome! 😊 Feel free to ask anything else about diseases. I'm here to help!"
-    
-    if any(w in question_lower for w in ['bye', 'goodbye', 'see you', 'exit']):
-        return "Goodbye! Stay healthy and informed. Feel free to come back anytime! 👋"
-    
-    return f"""🤖 **I can help you with {detected_disease} in {detected_country}!**
-
-**Try asking:**
-• 📊 "How many cases are there?"
-• 💊 "What are the symptoms?"
-• 🏥 "How is it treated?"
-• 🛡️ "How can I prevent it?"
-• ⚠️ "What are the risk factors?"
-• 📈 "Compare countries"
-
-**Quick Stats:**""" + (f"\n{stats['total_cases']:,} cases | {stats['total_deaths']:,} deaths | Trend: {stats['trend']}" if stats else "\nSelect disease/country from sidebar for data")
-
-
-with tab2:
-    st.header("🤖 AI Health Assistant")
-    
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
-    
-    st.markdown(f"""
-    <div style="background: linear-gradient(90deg, #1e3a8a 0%, #3b82f6 100%); padding: 15px; border-radius: 10px; margin-bottom: 20px;">
-        <p style="color: white; margin: 0; font-size: 14px;">💬 Currently discussing: <strong>{disease} in {country}</strong></p>
-        <p style="color: #93c5fd; margin: 5px 0 0 0; font-size: 12px;">Ask me anything about statistics, symptoms, treatment, or prevention!</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
+CHAT_RECENT_MESSAGES = 20
+CHAT_PAGE_MESSAGES = 20
+
+def show_chat_message(msg):
+    if msg["role"] == "user":
+        st.markdown(f"""
+        <div style="background-color: #1e40af; padding: 12px; border-radius: 10px; margin: 8px 0; margin-left: 20%;">
+            <p style="color: white; margin: 0;"><strong>You</strong></p>
+            <p style="color: #e0e7ff; margin: 5px 0 0 0;">{html.escape(msg['content'])}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown(f"""
+        <div style="background-color: #1e293b; padding: 12px; border-radius: 10px; margin: 8px 0; margin-right: 20%;">
+            <p style="color: #60a5fa; margin: 0;"><strong>🤖 AI Assistant</strong></p>
+            <div style="color: #e2e8f0; margin: 5px 0 0 0;">
+        """, unsafe_allow_html=True)
+        st.markdown(msg['content'])
+        st.markdown("</div></div>", unsafe_allow_html=True)
+
+# Runs as a fragment so sending a message only reruns the chat, not the
+# charts and forecasts in the other tabs.
+@st.fragment
+def chat_panel(disease, country):
+    history = st.session_state.chat_history
+    
+    # The form is handled before the history is drawn into this container,
+    # so a new turn shows up in the same run without st.rerun().
     chat_container = st.container()
-    with chat_container:
-        if len(st.session_state.chat_history) == 0:
-            st.info("👋 **Welcome!** Ask me any question about diseases, or try one of these:")
-            cols = st.columns(3)
-            suggestions = [
-                "📊 Show statistics",
-                "💊 What are symptoms?",
-                "🛡️ Prevention tips"
-            ]
-            
-            for i, suggestion in enumerate(suggestions):
-                with cols[i]:
-                    if st.button(suggestion, key=f"suggest_{i}", width='stretch'):
-                        st.session_state.chat_history.append({"role": "user", "content": suggestion})
-                        response = generate_response(suggestion, disease, country)
-                        st.session_state.chat_history.append({"role": "assistant", "content": response})
-                        st.rerun()
-        
-        for i, msg in enumerate(st.session_state.chat_history):
-            if msg["role"] == "user":
-                st.markdown(f"""
-                <div style="background-color: #1e40af; padding: 12px; border-radius: 10px; margin: 8px 0; margin-left: 20%;">
-                    <p style="color: white; margin: 0;"><strong>You</strong></p>
-                    <p style="color: #e0e7ff; margin: 5px 0 0 0;">{msg['content']}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div style="background-color: #1e293b; padding: 12px; border-radius: 10px; margin: 8px 0; margin-right: 20%;">
-                    <p style="color: #60a5fa; margin: 0;"><strong>🤖 AI Assistant</strong></p>
-                    <div style="color: #e2e8f0; margin: 5px 0 0 0;">
-                """, unsafe_allow_html=True)
-                st.markdown(msg['content'])
-                st.markdown("</div></div>", unsafe_allow_html=True)
     
     st.markdown("<div style='margin: 20px 0;'></div>", unsafe_allow_html=True)
     
@@ -715,17 +362,63 @@ with tab2:
             clear_button = st.form_submit_button("Clear", width='stretch')
     
     if submit_button and user_question.strip():
-        st.session_state.chat_history.append({"role": "user", "content": user_question})
-        
         with st.spinner("🤔 Thinking..."):
             response = generate_response(user_question, disease, country)
-        
-        st.session_state.chat_history.append({"role": "assistant", "content": response})
-        st.rerun()
+        append_turn(history, user_question, response)
     
     if clear_button:
+        history.clear()
+    
+    with chat_container:
+        if len(history) == 0:
+            suggestions_box = st.empty()
+            clicked = None
+            with suggestions_box.container():
+                st.info("👋 **Welcome!** Ask me any question about diseases, or try one of these:")
+                cols = st.columns(3)
+                suggestions = [
+                    "📊 Show statistics",
+                    "💊 What are symptoms?",
+                    "🛡️ Prevention tips"
+                ]
+                
+                for i, suggestion in enumerate(suggestions):
+                    with cols[i]:
+                        if st.button(suggestion, key=f"suggest_{i}", width='stretch'):
+                            clicked = suggestion
+            if clicked:
+                suggestions_box.empty()
+                append_turn(history, clicked, generate_response(clicked, disease, country))
+        
+        # Only the latest turns are rendered; older ones stay collapsed and
+        # are paged on request.
+        older = history[:-CHAT_RECENT_MESSAGES]
+        if older:
+            if st.toggle(f"🕘 Show {len(older) // 2} earlier questions", key="chat_show_older"):
+                pages = math.ceil(len(older) / CHAT_PAGE_MESSAGES)
+                page = st.number_input("Page", min_value=1, max_value=pages, value=pages, key="chat_page") if pages > 1 else 1
+                start = (page - 1) * CHAT_PAGE_MESSAGES
+                for msg in older[start:start + CHAT_PAGE_MESSAGES]:
+                    show_chat_message(msg)
+                st.markdown("---")
+        
+        for msg in history[-CHAT_RECENT_MESSAGES:]:
+            show_chat_message(msg)
+
+with tab2:
+    st.header("🤖 AI Health Assistant")
+    
+    if 'chat_history' not in st.session_state:
         st.session_state.chat_history = []
-        st.rerun()
+    
+    st.markdown(f"""
+    <div style="background: linear-gradient(90deg, #1e3a8a 0%, #3b82f6 100%); padding: 15px; border-radius: 10px; margin-bottom: 20px;">
+        <p style="color: white; margin: 0; font-size: 14px;">💬 Currently discussing: <strong>{disease} in {country}</strong></p>
+        <p style="color: #93c5fd; margin: 5px 0 0 0; font-size: 12px;">Ask me anything about statistics, symptoms, treatment, or prevention!</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    chat_panel(disease, country)
 
 with tab3:
     st.header("🔮 Predictions & Advanced Analytics")
@@ -755,7 +448,7 @@ with tab3:
         prediction_days = st.slider("Predict for next (days):", 30, 180, 90, step=30)
         
         with st.spinner("Training ML model and generating predictions..."):
-            future_df, confidence = predict_future_cases(data, prediction_days)
+            future_df, confidence = forecast_series(disease, country, prediction_days)
         
         if future_df is not None:
             col1, col2 = st.columns([3, 1])
@@ -767,42 +460,13 @@ with tab3:
                 st.info(f"""
                 **Model Details:**
                 - Algorithm: Polynomial Regression
-                - Training Data: {len(data)} days
+                - Training Data: {len(data)} {FREQUENCY_NAMES[data.attrs['freq']]} observations
                 - Forecast Period: {prediction_days} days
                 - Confidence: {'High' if confidence > 0.8 else 'Medium' if confidence > 0.6 else 'Low'}
                 """)
             
             with col1:
-                fig = go.Figure()
-                
-                fig.add_trace(go.Scatter(
-                    x=data['date'], 
-                    y=data['cases'],
-                    name='Historical Cases',
-                    line=dict(color='#1f77b4', width=2),
-                    fill='tozeroy',
-                    fillcolor='rgba(31, 119, 180, 0.2)'
-                ))
-                
-                fig.add_trace(go.Scatter(
-                    x=future_df['date'],
-                    y=future_df['predicted_cases'],
-                    name='Predicted Cases',
-                    line=dict(color='#ff7f0e', width=2, dash='dash'),
-                    fill='tozeroy',
-                    fillcolor='rgba(255, 127, 14, 0.1)'
-                ))
-                
-                fig.update_layout(
-                    title=f'{disease} Cases: Historical + {prediction_days}-Day Forecast',
-                    xaxis_title='Date',
-                    yaxis_title='Daily Cases',
-                    height=500,
-                    hovermode='x unified',
-                    showlegend=True
-                )
-                
-                st.plotly_chart(fig, width='stretch')
+                show_chart(forecast_figure(disease, country, prediction_days), width='stretch')
             
             st.subheader("📊 Forecast Summary")
             pred_col1, pred_col2, pred_col3 = st.columns(3)
@@ -820,6 +484,53 @@ with tab3:
                 total_predicted = int(future_df['predicted_cases'].sum())
                 st.metric("Total Forecast Cases", f"{total_predicted:,}")
         
+        if disease in SCENARIO_MODELS:
+            st.markdown("---")
+            
+            st.subheader("🧪 What-If Scenarios (SEIR Model)")
+            st.caption("Fitted to the recent trend, then 2,000 scenarios with varied transmission, "
+                       "incubation and infectious periods. Bands show the 5–95% and 25–75% ranges.")
+            
+            transmission_change = st.slider("Change in transmission (%)", -50, 50, 0, step=5,
+                                            help="e.g. -20 for masking or distancing that cuts transmission by 20%")
+            
+            scenario = run_scenarios(disease, country, transmission_change / 100)
+            
+            if scenario is not None:
+                fan, params = scenario
+                history = data[data['date'] >= data['date'].iloc[-1] - pd.Timedelta(days=180)] \
+                    if data.attrs['freq'] == 'D' else data
+                
+                fig_fan = go.Figure()
+                fig_fan.add_trace(go.Scatter(x=history['date'], y=history['cases'], name='Historical Cases',
+                                             line=dict(color='#1f77b4', width=2)))
+                for low, high, opacity, label in [('p5', 'p95', 0.15, '5–95%'), ('p25', 'p75', 0.3, '25–75%')]:
+                    fig_fan.add_trace(go.Scatter(x=fan['date'], y=fan[high], line=dict(width=0),
+                                                 showlegend=False, hoverinfo='skip'))
+                    fig_fan.add_trace(go.Scatter(x=fan['date'], y=fan[low], line=dict(width=0), fill='tonexty',
+                                                 fillcolor=f'rgba(214, 39, 40, {opacity})', name=label))
+                fig_fan.add_trace(go.Scatter(x=fan['date'], y=fan['p50'], name='Median Scenario',
+                                             line=dict(color='#d62728', width=2, dash='dash')))
+                fig_fan.update_layout(
+                    title=f'{disease} in {country}: {transmission_change:+d}% Transmission',
+                    xaxis_title='Date',
+                    yaxis_title=chart_ylabel,
+                    height=500,
+                    hovermode='x unified'
+                )
+                show_chart(fig_fan, width='stretch')
+                
+                scen_col1, scen_col2, scen_col3 = st.columns(3)
+                with scen_col1:
+                    st.metric("Fitted R (effective)", f"{params['r_eff']:.2f}")
+                with scen_col2:
+                    st.metric("Scenario R (effective)", f"{params['r_eff'] * (1 + transmission_change / 100):.2f}")
+                with scen_col3:
+                    st.metric("Median Total Cases", f"{int(fan['p50'].sum()):,}",
+                              help=f"Over the next {len(fan)} {FREQUENCY_NAMES[data.attrs['freq']]} periods")
+            else:
+                st.info("Not enough data to fit the scenario model.")
+        
         st.markdown("---")
         
         st.subheader("📉 Growth Rate Analysis")
@@ -841,71 +552,37 @@ with tab3:
             yaxis_title='Growth Rate (%)',
             height=400
         )
-        st.plotly_chart(fig_growth, width='stretch')
+        show_chart(fig_growth, width='stretch')
         
         st.subheader("🌍 Multi-Country Comparison Heatmap")
         
         comparison_countries = st.multiselect(
             "Select countries to compare:",
             COUNTRIES,
-            default=[country] + [c for c in ['America', 'India', 'China'] if c != country][:2]
+            default=heatmap_countries(country)
         )
         
         if len(comparison_countries) >= 2:
-            heatmap_data = []
-            months_labels = []
-            
-            for comp_country in comparison_countries:
-                comp_file = f"data/{disease.lower().replace('/', '_').replace(' ', '_').replace('-', '_')}_{comp_country.lower().replace(' ', '_')}.csv"
-                if os.path.exists(comp_file):
-                    comp_df = pd.read_csv(comp_file)
-                    comp_df['date'] = pd.to_datetime(comp_df['date'])
-                    
-                    recent_df = comp_df.tail(365)
-                    monthly = recent_df.groupby(recent_df['date'].dt.to_period('M'))['cases'].sum()
-                    
-                    if len(months_labels) == 0:
-                        months_labels = [str(p) for p in monthly.index[-12:]]
-                    
-                    monthly_values = monthly.values[-12:]
-                    if len(monthly_values) < 12:
-                        monthly_values = np.pad(monthly_values, (12 - len(monthly_values), 0), 'constant')
-                    
-                    heatmap_data.append({
-                        'country': comp_country,
-                        'data': monthly_values
-                    })
+            fig_heatmap = heatmap_figure(disease, comparison_countries)
             
-            if heatmap_data and len(heatmap_data) >= 2:
-                heatmap_matrix = np.array([d['data'] for d in heatmap_data])
-                countries_list = [d['country'] for d in heatmap_data]
-                
-                fig_heatmap = go.Figure(data=go.Heatmap(
-                    z=heatmap_matrix,
-                    x=months_labels,
-                    y=countries_list,
-                    colorscale='Reds',
-                    text=heatmap_matrix,
-                    texttemplate='%{text:,.0f}',
-                    textfont={"size": 10},
-                    hovertemplate='Country: %{y}<br>Month: %{x}<br>Cases: %{z:,.0f}<extra></extra>',
-                    colorbar=dict(title="Cases")
-                ))
-                fig_heatmap.update_layout(
-                    title=f'{disease} Cases: Multi-Country Comparison (Last 12 Months)',
-                    xaxis_title='Month',
-                    yaxis_title='Country',
-                    height=max(400, len(countries_list) * 80),
-                    font=dict(size=12),
-                    plot_bgcolor='#0f172a',
-                    paper_bgcolor='#0f172a'
-                )
-                st.plotly_chart(fig_heatmap, width='stretch')
+            if fig_heatmap is not None:
+                show_chart(fig_heatmap, width='stretch')
             else:
                 st.warning("⚠️ Not enough data to generate heatmap. Please select at least 2 countries with available data.")
         else:
             st.info("💡 Select at least 2 countries above to see the comparison heatmap.")
         
+        st.subheader("⏱️ Which Countries Lead?")
+        st.caption("Cross-correlation of case growth between every pair of countries. A positive value means "
+                   "the row country's waves come that many days before the column country's.")
+        
+        fig_lead_lag = lead_lag_figure(disease)
+        if fig_lead_lag is not None:
+            show_chart(fig_lead_lag, width='stretch')
+        else:
+            st.info("Not enough overlapping data, or data too coarse (one point per quarter or year), "
+                    "to compare countries.")
+        
         st.markdown("---")
         st.subheader("💾 Export Data")
         
@@ -956,100 +633,257 @@ Peak Cases: {stats_data['peak_cases']:,} on {stats_data['peak_date']}
                 )
     else:
         st.warning("No data loaded. Select a disease and country from the sidebar.")
+    
+    st.markdown("---")
+    
+    st.subheader("📦 Report Pack: All Diseases and Countries")
+    st.caption(f"Statistics, a {reports.FORECAST_DAYS}-day forecast and its interactive chart "
+               "for every pair, one file each, in a single ZIP.")
+    
+    pack_col1, pack_col2 = st.columns([1, 2])
+    with pack_col1:
+        pack_format = st.radio("Format", ["HTML", "Markdown"], horizontal=True, key="report_format")
+    with pack_col2:
+        if st.button("🛠️ Build Report Pack"):
+            pack_fmt = 'html' if pack_format == "HTML" else 'md'
+            # Rendered on threads over this process's warm caches; process
+            # pools are left to the command line.
+            with st.spinner("Generating reports for all pairs..."):
+                pack = io.BytesIO()
+                written = reports.write_reports(pack, pack_fmt)
+            st.session_state.report_pack = (pack_fmt, pack.getvalue(), written)
+        
+        if 'report_pack' in st.session_state:
+            pack_fmt, pack_bytes, written = st.session_state.report_pack
+            st.download_button(
+                label=f"📥 Download {written} Reports (ZIP)",
+                data=pack_bytes,
+                file_name=f"disease_reports_{datetime.now().strftime('%Y-%m-%d')}_{pack_fmt}.zip",
+                mime="application/zip"
+            )
 
 with tab4:
-    st.header("📰 Real-time Disease News")
-    st.markdown(f"Latest news about {disease} in {country}")
-    
-    if HAS_NEWS:
-        try:
-            feed_url = f"https://news.google.com/rss/search?q={disease.replace(' ', '+')}+{country.replace(' ', '+')}"
-            feed = feedparser.parse(feed_url)
-            
-            if feed.entries:
-                for i, entry in enumerate(feed.entries[:5]):
-                    st.subheader(f"📌 {entry.title}")
-                    if hasattr(entry, 'published'):
-                        st.caption(entry.published)
-                    if hasattr(entry, 'summary'):
-                        import re
-                        clean_summary = re.sub('<[^<]+?>', '', entry.summary)
-                        st.write(clean_summary)
-                    st.markdown(f"[Read more]({entry.link})")
-                    st.markdown("---")
-            else:
-                st.info("No recent news found. Try a different search.")
-                st.markdown(f"[Search Google News manually]({feed_url})")
-        except Exception as e:
-            st.warning(f"Unable to fetch news. [Search manually](https://news.google.com/search?q={disease.replace(' ', '+')}+{country.replace(' ', '+')})")
+    st.header("📰 Disease News")
+    st.markdown(f"News about {disease} in {country}, served from the local archive")
+    
+    news_archive = news.get_archive()
+    # Feeds are only fetched in the background; a pair that has never been
+    # fetched, or whose Refresh button is pressed, is queued ahead of the
+    # regular ingest cycle.
+    news_fetched = news_archive.last_fetched(disease, country) is not None
+    if HAS_NEWS and not news_fetched:
+        news.ingester.request(disease, country)
+    
+    news_col1, news_col2, news_col3 = st.columns([3, 1, 1])
+    with news_col1:
+        news_query = st.text_input("🔍 Search articles", key="news_query")
+    with news_col2:
+        news_period = st.selectbox("Published", list(news.PERIODS), key="news_period")
+    with news_col3:
+        st.write("")
+        news_refresh = HAS_NEWS and st.button("🔄 Refresh", key="news_refresh")
+    if news_refresh:
+        news.ingester.request(disease, country)
+        st.info("⏳ Fetching the latest articles in the background; they appear when the page next updates.")
+    
+    news_days = news.PERIODS[news_period]
+    news_since = datetime.now(timezone.utc) - pd.Timedelta(days=news_days) if news_days else None
+    news_total = news_archive.count(disease, country, news_query, news_since)
+    
+    if news_total:
+        news_pages = math.ceil(news_total / news.PAGE_SIZE)
+        news_page = st.number_input(f"Page (of {news_pages})", min_value=1, max_value=news_pages, value=1,
+                                    key=f"news_page_{disease}_{country}_{news_query}_{news_period}")
+        first = (news_page - 1) * news.PAGE_SIZE
+        st.caption(f"Showing {first + 1}–{min(first + news.PAGE_SIZE, news_total)} of {news_total:,} articles")
+        
+        for article in news_archive.search(disease, country, news_query, news_since, page=news_page):
+            st.subheader(f"📌 {article['title']}")
+            published = datetime.strptime(article['published'], '%Y-%m-%dT%H:%M:%S').strftime('%B %d, %Y %H:%M UTC')
+            st.caption(f"{published} · {article['source']}" if article['source'] else published)
+            if article['summary']:
+                st.write(article['summary'])
+            st.markdown(f"[Read more]({article['link']})")
+            st.markdown("---")
+    elif news_query or news_days:
+        st.info("No archived articles match. Try a different search or a longer period.")
+    elif HAS_NEWS and not news_fetched:
+        st.info("⏳ No news archived yet for this disease and country; fetching in the background. "
+                "Check back in a moment.")
+        st.markdown(f"[Search Google News]({news.search_url(disease, country)})")
     else:
-        st.info("News feed requires feedparser library")
-        news_url = f"https://news.google.com/search?q={disease.replace(' ', '+')}+{country.replace(' ', '+')}"
-        st.markdown(f"[Search Google News]({news_url})")
+        st.info("No news archived yet for this disease and country.")
+        st.markdown(f"[Search Google News]({news.search_url(disease, country)})")
+    
+    if not HAS_NEWS:
+        st.caption("Fetching new articles requires the feedparser library.")
 
 with tab5:
     st.header("⚠️ Disease Risk Calculator")
     st.markdown(f"Calculate your risk level for {disease}")
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        age = st.slider("Your Age", 0, 100, 30)
-        location = st.selectbox("Your Location", COUNTRIES)
-        symptoms = st.multiselect("Do you have any symptoms?", 
-                                  ["Fever", "Cough", "Fatigue", "Difficulty Breathing", 
-                                   "Loss of Taste/Smell", "Body Aches", "None"])
+    risk_mode = st.radio("Mode", ["👤 Single person", "📋 Patient list (CSV)"], horizontal=True)
     
-    with col2:
-        vaccinated = st.radio("Vaccination Status", ["Fully Vaccinated", "Partially Vaccinated", "Not Vaccinated"])
-        pre_conditions = st.multiselect("Pre-existing Conditions",
-                                       ["Diabetes", "Heart Disease", "Lung Disease", 
-                                        "Obesity", "Immunocompromised", "None"])
+    def discard_risk_upload():
+        scored_upload = st.session_state.pop('risk_upload', None)
+        if scored_upload is not None:
+            risk.remove_scored(scored_upload['path'])
     
-    if st.button("Calculate Risk"):
-        risk_score = 10
-        
-        if age > 60:
-            risk_score += 30
-        elif age > 40:
-            risk_score += 20
-        elif age > 20:
-            risk_score += 10
+    if risk_mode == "👤 Single person":
+        discard_risk_upload()
+        col1, col2 = st.columns(2)
         
-        risk_score += len(symptoms) * 5
-        risk_score += len(pre_conditions) * 10
-        
-        if vaccinated == "Not Vaccinated":
-            risk_score += 25
-        elif vaccinated == "Partially Vaccinated":
-            risk_score += 15
+        with col1:
+            age = st.slider("Your Age", 0, 100, 30)
+            location = st.selectbox("Your Location", COUNTRIES)
+            symptoms = st.multiselect("Do you have any symptoms?", risk.SYMPTOMS)
         
-        risk_score = min(risk_score, 100)
+        with col2:
+            vaccinated = st.radio("Vaccination Status", risk.VACCINATION_STATUSES)
+            pre_conditions = st.multiselect("Pre-existing Conditions", risk.PRE_CONDITIONS)
         
-        st.subheader("Your Risk Assessment")
+        if st.button("Calculate Risk"):
+            risk_score = risk.risk_score(age, symptoms, pre_conditions, vaccinated)
+            level = risk.risk_level(risk_score)
+            
+            st.subheader("Your Risk Assessment")
+            
+            if level == "Low":
+                st.success(f"🟢 Low Risk: {risk_score}%")
+                st.write("Your risk is relatively low. Continue following basic health guidelines.")
+            elif level == "Moderate":
+                st.warning(f"🟡 Moderate Risk: {risk_score}%")
+                st.write("You have moderate risk. Consider consulting a healthcare provider.")
+            else:
+                st.error(f"🔴 High Risk: {risk_score}%")
+                st.write("You have high risk factors. Please consult a healthcare professional immediately.")
+            
+            st.progress(risk_score / 100)
+    else:
+        st.markdown(
+            f"Upload a CSV with columns `{'`, `'.join(risk.INPUT_COLUMNS)}`. "
+            f"List several symptoms or conditions separated by `{risk.LIST_SEPARATOR}`, "
+            f"e.g. `Fever{risk.LIST_SEPARATOR}Cough`."
+        )
+        uploaded = st.file_uploader("Patient list", type=["csv"])
         
-        if risk_score < 30:
-            st.success(f"🟢 Low Risk: {risk_score}%")
-            st.write("Your risk is relatively low. Continue following basic health guidelines.")
-        elif risk_score < 60:
-            st.warning(f"🟡 Moderate Risk: {risk_score}%")
-            st.write("You have moderate risk. Consider consulting a healthcare provider.")
+        if uploaded is None:
+            discard_risk_upload()
         else:
-            st.error(f"🔴 High Risk: {risk_score}%")
-            st.write("You have high risk factors. Please consult a healthcare professional immediately.")
-        
-        st.progress(risk_score / 100)
+            # Each upload is scored once; reruns triggered by other widgets
+            # reuse the result. Scored rows are written to a file under
+            # risk.SCORED_DIR rather than kept in memory, and only read when
+            # downloaded; files of sessions that ended are swept by age.
+            scored_upload = st.session_state.get('risk_upload')
+            if (scored_upload is None or scored_upload['file_id'] != uploaded.file_id
+                    or not risk.keep_scored(scored_upload['path'])):
+                discard_risk_upload()
+                levels = {"Low": 0, "Moderate": 0, "High": 0}
+                rows = 0
+                preview = None
+                output = risk.scored_file()
+                progress = st.empty()
+                try:
+                    with output:
+                        for i, scored in enumerate(risk.score_csv(uploaded)):
+                            scored.to_csv(output, header=i == 0, index=False)
+                            for level, n in scored["risk_level"].value_counts().items():
+                                levels[level] += int(n)
+                            rows += len(scored)
+                            if preview is None:
+                                preview = scored.head(100)
+                            progress.caption(f"Scored {rows:,} people...")
+                    scored_upload = {'file_id': uploaded.file_id, 'path': output.name,
+                                     'rows': rows, 'levels': levels, 'preview': preview}
+                    st.session_state.risk_upload = scored_upload
+                except ValueError as e:
+                    risk.remove_scored(output.name)
+                    scored_upload = None
+                    st.error(f"Could not score file: {str(e)}")
+                progress.empty()
+            
+            if scored_upload is not None:
+                levels = scored_upload['levels']
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("People Scored", f"{scored_upload['rows']:,}")
+                with col2:
+                    st.metric("🟢 Low", f"{levels['Low']:,}")
+                with col3:
+                    st.metric("🟡 Moderate", f"{levels['Moderate']:,}")
+                with col4:
+                    st.metric("🔴 High", f"{levels['High']:,}")
+                
+                if scored_upload['preview'] is not None:
+                    st.dataframe(scored_upload['preview'], hide_index=True, width='stretch')
+                
+                def read_scored(path=scored_upload['path']):
+                    with open(path, 'rb') as f:
+                        return f.read()
+                
+                st.download_button(
+                    label="📥 Download Scored List",
+                    data=read_scored,
+                    file_name="risk_scores.csv",
+                    mime="text/csv"
+                )
 
 st.sidebar.markdown("---")
 st.sidebar.header("Disease Information")
-disease_info_file = f"content/diseases/{disease_file}_info.txt"
 if os.path.exists(disease_info_file):
     try:
-        with open(disease_info_file, 'r', encoding='utf-8') as f:
-            disease_info = f.read()
+        disease_info = read_text(disease_info_file)
         with st.sidebar.expander("View Disease Info"):
             st.write(disease_info)
     except Exception as e:
         st.sidebar.error(f"Error loading disease info: {str(e)}")
 else:
     st.sidebar.info("Disease information coming soon")
+
+rerun_elapsed = time.perf_counter() - rerun_start
+perf.record('rerun', rerun_elapsed)
+
+# The first page is already rendered; precompute the other pairs in the
+# background (no-op after the first run in this process).
+warmup.end_render()
+# Preload plotly, scikit-learn, scipy, gTTS and feedparser between renders.
+warm_up()
+warm_progress = warmup.start().progress()
+if warm_progress['running']:
+    st.sidebar.caption(f"⏳ Warming caches: {warm_progress['done']}/{warm_progress['total'] or '…'}")
+
+# Reload data/ and content/ edits without a restart; only the changed pairs
+# are recomputed.
+data_status = watcher.start().status()
+news.start_ingest()
+monitor.start()
+if data_status['updated']:
+    st.sidebar.caption(f"🗂️ Data version {data_status['version']} · "
+                       f"updated {datetime.fromtimestamp(data_status['updated']).strftime('%H:%M:%S')}")
+if 'rerun_times' not in st.session_state:
+    st.session_state.rerun_times = []
+st.session_state.rerun_times = (st.session_state.rerun_times + [rerun_elapsed])[-200:]
+
+# Hidden performance panel, enabled with ?perf=1 in the URL
+if st.query_params.get("perf") == "1":
+    st.sidebar.markdown("---")
+    with st.sidebar.expander("⏱ Performance", expanded=True):
+        session_times = st.session_state.rerun_times
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Last Rerun", f"{rerun_elapsed * 1000:.0f} ms")
+        with col2:
+            st.metric("Session p95", f"{perf.percentile(session_times, 95) * 1000:.0f} ms",
+                      help=f"{len(session_times)} reruns in this session")
+        st.dataframe(pd.DataFrame(perf.summary()), hide_index=True, width='stretch')
+        st.caption("Cache warm-up")
+        st.json(warm_progress)
+        st.caption("Data watcher")
+        st.json(data_status)
+        st.json(perf.counters())
+        st.download_button(
+            label="📥 Download perf.json",
+            data=perf.dump_json(),
+            file_name=f"perf_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json"
+        )
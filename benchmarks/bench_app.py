@@ -0,0 +1,218 @@
+"""Headless load test for app.py.
+
+Drives the Streamlit script through Streamlit's AppTest harness with scripted
+interactions and reports rerun latency percentiles, throughput and memory per
+session. Runs offline: feedparser and gTTS are replaced by local stubs.
+
+AppTest keeps process-global state, so concurrent sessions each run in their
+own worker process.
+
+    python -m benchmarks.bench_app --sessions 8 --rounds 3
+"""
+import argparse
+import importlib.machinery
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Stub headlines go to a throwaway archive, not the real one.
+os.environ.setdefault('TRACKER_NEWS_DB', os.path.join(tempfile.gettempdir(), 'bench_news_archive.db'))
+
+from tracker import perf  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+
+def install_offline_stubs():
+    feedparser = types.ModuleType('feedparser')
+    feedparser.__spec__ = importlib.machinery.ModuleSpec('feedparser', None)
+
+    def parse(url):
+        entries = [
+            types.SimpleNamespace(
+                title=f"Stub headline {i}",
+                published="Mon, 01 Jan 2025 00:00:00 GMT",
+                summary="<p>Offline benchmark entry.</p>",
+                link=f"https://example.invalid/news/{i}",
+            )
+            for i in range(5)
+        ]
+        return types.SimpleNamespace(entries=entries)
+
+    feedparser.parse = parse
+    sys.modules['feedparser'] = feedparser
+    # News feeds are downloaded before parsing; hand the URL straight to the
+    # stub instead.
+    import tracker.news
+    tracker.news.download = lambda url, timeout=None: url
+
+    gtts = types.ModuleType('gtts')
+    gtts.__spec__ = importlib.machinery.ModuleSpec('gtts', None)
+
+    class gTTS:
+        def __init__(self, text, lang='en', slow=False):
+            self.text = text
+
+        def write_to_fp(self, fp):
+            fp.write(b'ID3' + b'\x00' * 128)
+
+    gtts.gTTS = gTTS
+    sys.modules['gtts'] = gtts
+
+
+def by_label(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+def send_chat(at, message):
+    at.text_input(key="user_input").input(message)
+    by_label(at.button, "Send").click()
+
+
+# Each step mutates the session and is followed by one timed rerun.
+SCENARIO = [
+    ("switch_disease", lambda at: by_label(at.selectbox, "Select Disease").select("COVID-19")),
+    ("switch_country", lambda at: by_label(at.selectbox, "Select Country").select("Japan")),
+    ("move_slider", lambda at: by_label(at.slider, "Predict for next (days):").set_value(180)),
+    ("chat_stats", lambda at: send_chat(at, "How many cases are there?")),
+    ("chat_symptoms", lambda at: send_chat(at, "What are the symptoms?")),
+    ("compare_on", lambda at: by_label(at.checkbox, "🔄 Compare with another country").check()),
+    ("compare_off", lambda at: by_label(at.checkbox, "🔄 Compare with another country").uncheck()),
+    ("switch_back", lambda at: by_label(at.selectbox, "Select Disease").select("Diabetes")),
+]
+
+
+def new_session(timeout):
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+
+def timed_run(at, timings, name):
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"{name}: {at.exception[0].message}")
+    timings.append((name, elapsed))
+
+
+def run_session(rounds, timeout):
+    timings = []
+    at = new_session(timeout)
+    timed_run(at, timings, "initial")
+    for _ in range(rounds):
+        for name, action in SCENARIO:
+            action(at)
+            timed_run(at, timings, name)
+    return timings
+
+
+def init_worker():
+    os.chdir(ROOT)
+    install_offline_stubs()
+
+
+def worker(rounds, timeout):
+    # Warm the process first so import cost is not charged to the run.
+    run_session(0, timeout)
+    perf.reset()
+    timings = run_session(rounds, timeout)
+    return timings, perf.snapshot()
+
+
+def measure_memory(sessions, timeout):
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    alive = []
+    for _ in range(sessions):
+        at = new_session(timeout)
+        at.run()
+        alive.append(at)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (current - baseline) / sessions, peak - baseline
+
+
+def summarize(timings):
+    by_step = {}
+    for name, elapsed in timings:
+        by_step.setdefault(name, []).append(elapsed)
+    rows = []
+    for name, values in by_step.items():
+        rows.append({
+            'step': name,
+            'reruns': len(values),
+            'p50_ms': round(perf.percentile(values, 50) * 1000, 1),
+            'p95_ms': round(perf.percentile(values, 95) * 1000, 1),
+            'p99_ms': round(perf.percentile(values, 99) * 1000, 1),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless rerun benchmark for app.py")
+    parser.add_argument('--sessions', type=int, default=4, help="concurrent simulated sessions")
+    parser.add_argument('--rounds', type=int, default=2, help="scenario repetitions per session")
+    parser.add_argument('--timeout', type=float, default=120, help="per-rerun timeout in seconds")
+    parser.add_argument('--skip-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--json', help="write the full report to this path")
+    args = parser.parse_args()
+
+    init_worker()
+
+    timings = []
+    snapshots = []
+    with ProcessPoolExecutor(max_workers=args.sessions, initializer=init_worker) as pool:
+        futures = [pool.submit(worker, args.rounds, args.timeout) for _ in range(args.sessions)]
+        results = [future.result() for future in futures]
+    for session_timings, snapshot in results:
+        timings.extend(session_timings)
+        snapshots.append(snapshot)
+    # Sessions run in parallel, so the slowest one bounds wall time; worker
+    # start-up and warm-up are excluded.
+    wall = max(sum(elapsed for _, elapsed in session_timings) for session_timings, _ in results)
+
+    all_values = [elapsed for _, elapsed in timings]
+    report = {
+        'sessions': args.sessions,
+        'rounds': args.rounds,
+        'reruns': len(timings),
+        'wall_s': round(wall, 2),
+        'throughput_reruns_per_s': round(len(timings) / wall, 2) if wall else 0.0,
+        'p50_ms': round(perf.percentile(all_values, 50) * 1000, 1),
+        'p95_ms': round(perf.percentile(all_values, 95) * 1000, 1),
+        'p99_ms': round(perf.percentile(all_values, 99) * 1000, 1),
+        'steps': summarize(timings),
+        'workers': snapshots,
+    }
+    if not args.skip_memory:
+        per_session, peak = measure_memory(args.sessions, args.timeout)
+        report['memory_per_session_mb'] = round(per_session / 1e6, 2)
+        report['memory_peak_mb'] = round(peak / 1e6, 2)
+
+    print(f"{report['reruns']} reruns across {args.sessions} sessions in {report['wall_s']}s "
+          f"({report['throughput_reruns_per_s']} reruns/s)")
+    print(f"rerun latency p50={report['p50_ms']}ms p95={report['p95_ms']}ms p99={report['p99_ms']}ms")
+    if 'memory_per_session_mb' in report:
+        print(f"memory per session {report['memory_per_session_mb']} MB (peak {report['memory_peak_mb']} MB)")
+    print(f"{'step':<16}{'reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for row in report['steps']:
+        print(f"{row['step']:<16}{row['reruns']:>8}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Lead/lag matrix benchmark.
+
+Times the batched FFT cross-correlation behind the Predictions tab lead/lag
+matrix against pairwise lagged correlations with pandas (Series.corr on a
+shifted copy, every pair and lag), for each disease in data/ and for larger
+synthetic country panels. Best lags are checked against a direct numpy sum.
+
+    python -m benchmarks.bench_leadlag --countries 10 50 200 --days 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tracker.analytics import MAX_LAG_DAYS, aligned_series, cross_correlation, growth_matrix  # noqa: E402
+from tracker.data import COUNTRIES, DISEASES  # noqa: E402
+from tracker.resample import FREQUENCIES, detect_frequency  # noqa: E402
+
+
+def pandas_loop(growth, max_lag):
+    best = np.zeros((growth.shape[1], growth.shape[1]), dtype=int)
+    for i, a in enumerate(growth.columns):
+        for j, b in enumerate(growth.columns):
+            corr = [growth[a].corr(growth[b].shift(-k)) for k in range(-max_lag, max_lag + 1)]
+            best[i, j] = int(np.nanargmax(corr)) - max_lag
+    return best
+
+
+def direct(matrix, max_lag):
+    length = matrix.shape[0]
+    out = np.empty((2 * max_lag + 1, matrix.shape[1], matrix.shape[1]))
+    for k in range(-max_lag, max_lag + 1):
+        if k >= 0:
+            out[k + max_lag] = matrix[:length - k].T @ matrix[k:] / length
+        else:
+            out[k + max_lag] = matrix[-k:].T @ matrix[:length + k] / length
+    return out
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FFT lead/lag matrix vs pandas loops")
+    parser.add_argument('--countries', type=int, nargs='+', default=[10, 50, 200])
+    parser.add_argument('--days', type=int, default=2000)
+    parser.add_argument('--pandas-limit', type=int, default=10, help="skip the pandas loop above this many series")
+    args = parser.parse_args()
+
+    print(f"{'panel':<28} {'lags':>5} {'fft ms':>9} {'pandas ms':>10} {'speedup':>8}")
+    for disease in DISEASES:
+        aligned = aligned_series(disease, COUNTRIES)
+        step_days = FREQUENCIES[detect_frequency(aligned.index)]
+        if step_days > MAX_LAG_DAYS:
+            continue
+        growth = growth_matrix(aligned.dropna(axis=1, how='all'), step_days)
+        max_lag = int(min(MAX_LAG_DAYS // step_days, len(growth) // 2))
+
+        cross, fft_ms = timed(cross_correlation, growth.to_numpy(), max_lag)
+        assert np.allclose(cross, direct(growth.to_numpy(), max_lag)), disease
+        _, pandas_ms = timed(pandas_loop, growth, max_lag)
+        print(f"{disease + f' ({len(growth)} steps)':<28} {2 * max_lag + 1:>5} {fft_ms:>9.2f} "
+              f"{pandas_ms:>10.0f} {pandas_ms / fft_ms:>7.0f}x")
+
+    rng = np.random.default_rng(0)
+    max_lag = MAX_LAG_DAYS
+    for size in args.countries:
+        # Shared random waves, each series shifted by its own lead.
+        base = np.cumsum(rng.normal(size=args.days + 2 * max_lag))
+        shifts = rng.integers(0, max_lag, size)
+        panel = np.stack([base[s:s + args.days] for s in shifts], axis=1) + rng.normal(0, 0.5, (args.days, size))
+        growth = pd.DataFrame(np.diff(panel, axis=0))
+        growth = (growth - growth.mean()) / growth.std(ddof=0)
+
+        cross, fft_ms = timed(cross_correlation, growth.to_numpy(), max_lag)
+        found = cross.argmax(axis=0) - max_lag
+        expected = shifts[:, None] - shifts[None, :]
+        accuracy = (found == expected).mean()
+        if size <= args.pandas_limit:
+            _, pandas_ms = timed(pandas_loop, growth, max_lag)
+            pandas_col, speedup = f"{pandas_ms:>10.0f}", f"{pandas_ms / fft_ms:>7.0f}x"
+        else:
+            pandas_col, speedup = f"{'-':>10}", f"{'-':>8}"
+        print(f"{f'synthetic {size} x {args.days}':<28} {2 * max_lag + 1:>5} {fft_ms:>9.2f} {pandas_col} {speedup}"
+              f"   lags recovered {accuracy:.0%}")
+
+
+if __name__ == '__main__':
+    main()
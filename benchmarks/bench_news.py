@@ -0,0 +1,118 @@
+"""News archive benchmark.
+
+Writes synthetic RSS fixture feeds for every disease/country pair (a share
+of items repeated across feeds and re-posted under new links), ingests them
+through feedparser into a scratch archive, checks deduplication, and times
+the News tab queries: a page, a full-text search, a date-filtered search and
+a deep page, next to a LIKE scan over the same rows.
+
+    python -m benchmarks.bench_news --articles 1000 10000 100000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tracker.data import COUNTRIES, DISEASES  # noqa: E402
+from tracker.news import NewsArchive, fixture_path  # noqa: E402
+
+WORDS = ("outbreak vaccine hospital cases surge decline study ministry screening report "
+         "clinic trial funding campaign patients rural urban testing variant treatment").split()
+
+
+def write_fixtures(directory, articles, duplicate_rate=0.2, seed=0):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    pairs = [(d, c) for d in DISEASES for c in COUNTRIES]
+    feeds = {pair: [] for pair in pairs}
+    unique = 0
+    for i in range(articles):
+        pair = pairs[i % len(pairs)]
+        if feeds[pair] and rng.random() < duplicate_rate:
+            # Same story again: either in another pair's feed or re-posted
+            # under a new link with the same title.
+            title, link, published = rng.choice(feeds[pair])
+            if rng.random() < 0.5:
+                link = f"{link}?utm={i}"
+            feeds[rng.choice(pairs)].append((title, link, published))
+            continue
+        title = f"{pair[0]} {pair[1]} " + ' '.join(rng.choices(WORDS, k=6)) + f" #{i}"
+        feeds[pair].append((title, f"https://news.example/{i}", now - timedelta(hours=rng.randrange(24 * 730))))
+        unique += 1
+
+    for (disease, country), items in feeds.items():
+        body = ''.join(
+            f"<item><title>{escape(title)}</title><link>{escape(link)}</link>"
+            f"<pubDate>{format_datetime(published)}</pubDate>"
+            f"<description>{escape(title)} — summary</description></item>"
+            for title, link, published in items
+        )
+        with open(fixture_path(directory, disease, country), 'w') as f:
+            f.write(f"<?xml version='1.0'?><rss version='2.0'><channel><title>{disease}</title>{body}</channel></rss>")
+    return unique
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def run(articles):
+    scratch = tempfile.mkdtemp()
+    try:
+        unique = write_fixtures(scratch, articles)
+        archive = NewsArchive(os.path.join(scratch, 'news.db'))
+
+        start = time.perf_counter()
+        added = archive.ingest_all(scratch)
+        elapsed = time.perf_counter() - start
+        assert added == unique, (added, unique)
+        assert archive.ingest_all(scratch) == 0, "re-ingesting the same feeds added articles"
+        print(f"\n{articles:,} feed items: {added:,} unique articles, ingest {elapsed:.2f}s "
+              f"({articles / elapsed:,.0f} items/s), re-ingest added 0")
+
+        disease, country = DISEASES[3], COUNTRIES[0]
+        month = datetime.now() - timedelta(days=30)
+        total = archive.count(disease, country)
+        deep = max(total // 10, 1)
+        checks = [
+            ('first page', lambda: archive.search(disease, country)),
+            ('search "vaccine"', lambda: archive.search(disease, country, 'vaccine')),
+            ('search + past month', lambda: archive.search(disease, country, 'hospital surge', since=month)),
+            (f'page {deep}', lambda: archive.search(disease, country, page=deep)),
+            ('count "vaccine"', lambda: archive.count(disease, country, 'vaccine')),
+            ('LIKE scan "vaccine"', lambda: archive.conn.execute(
+                "SELECT COUNT(*) FROM articles WHERE title LIKE '%vaccine%' OR summary LIKE '%vaccine%'").fetchone()),
+        ]
+        for name, fn in checks:
+            ms, _ = best_of(fn)
+            print(f"  {name:<22} {ms:>8.2f} ms")
+        archive.conn.close()
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="News archive ingest and query latency")
+    parser.add_argument('--articles', type=int, nargs='+', default=[1000, 10000])
+    args = parser.parse_args()
+
+    for articles in args.articles:
+        run(articles)
+
+
+if __name__ == '__main__':
+    main()
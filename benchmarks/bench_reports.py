@@ -0,0 +1,88 @@
+"""Bulk report benchmark.
+
+Times writing the report pack for all 60 disease/country pairs at several
+pool sizes, on threads (the app's Build Report Pack button) and in worker
+processes (the command line). Each measurement runs in a fresh interpreter
+with no shared cache directory: "cold" starts with empty caches, "warm" runs
+the background warm-up first. Every ZIP is checked against the first one.
+
+    python -m benchmarks.bench_reports --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+POOLS = ('threads', 'processes')
+
+
+def child(mode, workers, fmt, output, pool):
+    from benchmarks.bench_app import install_offline_stubs
+
+    install_offline_stubs()
+    from tracker import reports, warmup
+
+    if mode == 'warm':
+        warmer = warmup.Warmer()
+        warmer.start()
+        warmer.wait()
+
+    start = time.perf_counter()
+    written = reports.write_reports(output, fmt, workers=workers, processes=pool == 'processes')
+    print(json.dumps({'seconds': time.perf_counter() - start, 'written': written}))
+
+
+def spawn(mode, workers, fmt, output, pool):
+    env = {k: v for k, v in os.environ.items() if k not in ('TRACKER_CACHE_DIR', 'TRACKER_DB')}
+    out = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_reports', '--child', mode, '--workers', str(workers),
+         '--format', fmt, '--output', output, '--pool', pool],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def contents(path):
+    # Report bodies without the generation timestamp.
+    with zipfile.ZipFile(path) as archive:
+        return {name: b'\n'.join(line for line in archive.read(name).splitlines() if b'Generated' not in line)
+                for name in archive.namelist()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report pack wall time vs. pool kind and size")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--format', choices=['html', 'md'], default='html')
+    parser.add_argument('--child', choices=['cold', 'warm'])
+    parser.add_argument('--output')
+    parser.add_argument('--pool', choices=POOLS, nargs='+', default=list(POOLS))
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.workers[0], args.format, args.output, args.pool[0])
+        return
+
+    print(f"{os.cpu_count()} CPU(s), format {args.format}")
+    with tempfile.TemporaryDirectory() as scratch:
+        baseline = None
+        for pool in args.pool:
+            for mode in ('cold', 'warm'):
+                for workers in args.workers:
+                    output = os.path.join(scratch, f'{pool}_{mode}_{workers}.zip')
+                    result = spawn(mode, workers, args.format, output, pool)
+                    files = contents(output)
+                    baseline = baseline or files
+                    assert files == baseline, f"{pool} {mode} with {workers} workers wrote different reports"
+                    print(f"{pool:<9} {mode:<5} {workers:>2} worker(s): {result['written']} reports in "
+                          f"{result['seconds']:6.2f}s ({os.path.getsize(output) / 1e6:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
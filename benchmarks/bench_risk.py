@@ -0,0 +1,68 @@
+"""Throughput benchmark for batch risk scoring.
+
+Checks that the vectorized engine matches the single-person rules (see
+benchmarks.check_risk), then compares rows/second for the per-row loop,
+score_batch, and chunked CSV streaming. Peak memory of the streaming run is
+measured in a second pass, since tracemalloc slows it down several times.
+
+    python -m benchmarks.bench_risk --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.check_risk import check_parity, random_people, single_scores  # noqa: E402
+from tracker import risk  # noqa: E402
+
+
+def rate(rows, seconds):
+    return f"{rows / seconds:>14,.0f} rows/s ({seconds:.2f}s)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch risk scoring throughput")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--loop-rows', type=int, default=50_000, help="rows for the per-row baseline")
+    parser.add_argument('--chunksize', type=int, default=risk.DEFAULT_CHUNKSIZE)
+    parser.add_argument('--parity-rows', type=int, default=20_000)
+    args = parser.parse_args()
+
+    check_parity(args.parity_rows)
+
+    people = random_people(args.rows)
+
+    sample = people.head(args.loop_rows)
+    start = time.perf_counter()
+    single_scores(sample)
+    print(f"per-row loop     {rate(len(sample), time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    risk.score_batch(people)
+    print(f"score_batch      {rate(args.rows, time.perf_counter() - start)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'people.csv')
+        destination = os.path.join(tmp, 'scored.csv')
+        people.to_csv(source, index=False)
+        del people, sample
+
+        start = time.perf_counter()
+        rows, levels = risk.score_csv_file(source, destination, chunksize=args.chunksize)
+        print(f"csv streaming    {rate(rows, time.perf_counter() - start)}")
+
+        tracemalloc.start()
+        risk.score_csv_file(source, destination, chunksize=args.chunksize)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    print(f"peak memory      {peak / 1e6:.1f} MB streaming with chunksize {args.chunksize:,}")
+    print(f"levels           {levels}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""SEIR scenario sweep throughput.
+
+Fits the model to a real series and integrates sweeps of growing size in one
+vectorized call, reporting scenarios/second. The same scenarios run one at a
+time in a Python loop give the baseline and must produce identical curves.
+
+    python -m benchmarks.bench_scenario --sizes 100 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tracker.data import load_series  # noqa: E402
+from tracker.scenario import POPULATIONS, SCENARIO_MODELS, fit_model, simulate, sweep  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized SEIR sweep throughput")
+    parser.add_argument('--disease', default='COVID-19', choices=sorted(SCENARIO_MODELS))
+    parser.add_argument('--country', default='India', choices=sorted(POPULATIONS))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--loop', type=int, default=200, help="scenarios for the one-at-a-time baseline")
+    args = parser.parse_args()
+
+    settings = SCENARIO_MODELS[args.disease]
+    fit = fit_model(load_series(args.disease, args.country), POPULATIONS[args.country], **settings)
+    dt = settings['dt']
+    print(f"{args.disease} / {args.country}: R_eff {fit['r_eff']:.2f}, {args.days} days, dt {dt}")
+
+    beta, sigma, gamma = sweep(fit, scenarios=args.loop)
+    start = time.perf_counter()
+    looped = np.vstack([simulate(fit, beta[i:i + 1], sigma[i:i + 1], gamma[i:i + 1], args.days, dt)
+                        for i in range(args.loop)])
+    loop_rate = args.loop / (time.perf_counter() - start)
+    vectorized = simulate(fit, beta, sigma, gamma, args.days, dt)
+    assert np.allclose(looped, vectorized, rtol=1e-9, atol=1e-6), "vectorized sweep differs from the loop"
+    print(f"  python loop     {args.loop:>8,} scenarios  {loop_rate:>12,.0f} scenarios/s")
+
+    for size in args.sizes:
+        params = sweep(fit, scenarios=size)
+        start = time.perf_counter()
+        simulate(fit, *params, args.days, dt)
+        elapsed = time.perf_counter() - start
+        print(f"  vectorized      {size:>8,} scenarios  {size / elapsed:>12,.0f} scenarios/s "
+              f"({elapsed * 1000:.0f} ms, {size / elapsed / loop_rate:.0f}x loop)")
+
+
+if __name__ == '__main__':
+    main()
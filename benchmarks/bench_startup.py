@@ -0,0 +1,68 @@
+"""Cold-start import benchmark based on ``python -X importtime``.
+
+Each sample runs a fresh interpreter, so nothing is cached in-process. The
+"core" target is what a worker pays to import the tracker package; "eager"
+additionally imports every heavy optional dependency, which is what app.py
+used to pay before the first paint.
+
+    python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tracker.lazy import HEAVY_MODULES  # noqa: E402
+
+TARGETS = {
+    'core': "import tracker",
+    'app_imports': "import streamlit, pandas, tracker, tracker.lazy, tracker.news, tracker.tts",
+    'eager': "import streamlit, pandas, tracker; " + "; ".join(f"import {m}" for m in HEAVY_MODULES),
+}
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_times(code):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            cumulative_us, depth, name = int(match.group(2)), len(match.group(3)), match.group(4)
+            if depth == 1:
+                modules[name] = cumulative_us
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import time benchmark")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help="slowest top-level imports to list")
+    args = parser.parse_args()
+
+    for target, code in TARGETS.items():
+        totals = []
+        slowest = {}
+        for _ in range(args.repeat):
+            modules = import_times(code)
+            totals.append(sum(modules.values()))
+            for name, us in modules.items():
+                slowest.setdefault(name, []).append(us)
+        print(f"{target:<12} median {statistics.median(totals) / 1000:8.1f} ms  "
+              f"(min {min(totals) / 1000:.1f} ms over {args.repeat} runs)")
+        ranked = sorted(slowest.items(), key=lambda item: -statistics.median(item[1]))
+        for name, values in ranked[:args.top]:
+            print(f"    {name:<40}{statistics.median(values) / 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""CSV vs SQLite store benchmark.
+
+Writes synthetic daily COVID-19 series for every country into a scratch
+data directory at growing scales, imports them into a SeriesStore and times
+the app's read patterns both ways: a one-day lookup, the last 30 days, the
+summary behind the stats panel and a cross-country total. The CSV column
+parses the file each time, which is what every cache miss (first render,
+new worker, changed file) pays today.
+
+    python -m benchmarks.bench_store --scales 1 10 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import tracker.data as data  # noqa: E402
+from tracker import resample  # noqa: E402
+from tracker.store import SeriesStore  # noqa: E402
+
+DISEASE = 'COVID-19'
+BASE_DAYS = 2000
+
+
+def write_series(directory, days, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('1700-01-01', periods=days, freq='D')
+    for country in data.COUNTRIES:
+        cases = rng.poisson(rng.uniform(100, 10_000), size=days)
+        pd.DataFrame({
+            'date': dates.strftime('%Y-%m-%d'),
+            'cases': cases,
+            'deaths': rng.binomial(cases, 0.01),
+        }).to_csv(os.path.join(directory, os.path.basename(data.data_path(DISEASE, country))), index=False)
+    return dates
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def csv_day(day):
+    df = data.read_csv(data.data_path(DISEASE, data.COUNTRIES[0]))
+    row = df[df['date'] == day]
+    return int(row['cases'].iloc[0]), int(row['deaths'].iloc[0])
+
+
+def csv_recent(since):
+    df = data.read_csv(data.data_path(DISEASE, data.COUNTRIES[0]))
+    return df[df['date'] >= since].reset_index(drop=True)
+
+
+def csv_summary():
+    df = data.read_csv(data.data_path(DISEASE, data.COUNTRIES[0])).sort_values('date')
+    return data.build_analysis(DISEASE, data.summarize_frame(df))
+
+
+def heatmap(frames):
+    # The aggregation behind analytics.monthly_heatmap.
+    return resample.align(frames, 'MS').dropna(how='all').tail(12)
+
+
+def csv_heatmap():
+    return heatmap({c: data.read_csv(data.data_path(DISEASE, c)) for c in data.COUNTRIES})
+
+
+def store_heatmap(store, since):
+    return heatmap({c: store.window(DISEASE, c, since) for c in data.COUNTRIES})
+
+
+def run(scale, repeat):
+    days = BASE_DAYS * scale
+    with tempfile.TemporaryDirectory() as directory:
+        data.DATA_DIR = directory
+        dates = write_series(directory, days)
+        day = dates[len(dates) // 2]
+        since = dates[-30]
+        heatmap_since = dates[-1].to_period('M').start_time - pd.DateOffset(months=13)
+
+        store = SeriesStore(os.path.join(directory, 'tracker.db'))
+        start = time.perf_counter()
+        for country in data.COUNTRIES:
+            store.sync(DISEASE, country)
+        import_s = time.perf_counter() - start
+        country = data.COUNTRIES[0]
+
+        checks = [
+            ('day lookup', lambda: csv_day(day), lambda: store.day(DISEASE, country, day)),
+            ('last 30 days', lambda: csv_recent(since), lambda: store.window(DISEASE, country, since)),
+            ('summary', csv_summary, lambda: data.build_analysis(DISEASE, store.summary(DISEASE, country))),
+            ('12-month heatmap', csv_heatmap, lambda: store_heatmap(store, heatmap_since)),
+        ]
+        rows = days * len(data.COUNTRIES)
+        print(f"\n{scale}x: {len(data.COUNTRIES)} series x {days:,} days = {rows:,} rows, "
+              f"import {import_s:.2f}s ({rows / import_s:,.0f} rows/s)")
+        print(f"  {'query':<18} {'csv ms':>9} {'sqlite ms':>10} {'speedup':>8}")
+        for name, csv_fn, store_fn in checks:
+            csv_ms, expected = best_of(csv_fn, repeat)
+            store_ms, actual = best_of(store_fn, repeat)
+            if name == 'last 30 days':
+                assert expected[['cases', 'deaths']].equals(actual[['cases', 'deaths']]), name
+            elif name == '12-month heatmap':
+                assert expected.equals(actual), name
+            else:
+                assert expected == actual, name
+            print(f"  {name:<18} {csv_ms:>9.2f} {store_ms:>10.2f} {csv_ms / store_ms:>7.1f}x")
+        store.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV vs SQLite query latency")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        run(scale, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
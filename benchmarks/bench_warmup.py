@@ -0,0 +1,83 @@
+"""Cache warm-up benchmark.
+
+Each measurement runs in a fresh interpreter with no shared cache directory.
+"cold" times the first visit of every disease/country pair with empty caches,
+which is what users see right after a deploy. "warm" starts the background
+warm-up, waits for it and times the same visits. Warm-up wall time is
+reported for each worker count.
+
+    python -m benchmarks.bench_warmup --workers 1 2 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tracker import perf  # noqa: E402
+
+
+def child(mode, workers):
+    from benchmarks.bench_app import install_offline_stubs
+
+    install_offline_stubs()
+    from tracker import warmup
+
+    result = {}
+    if mode == 'warm':
+        warmer = warmup.Warmer(workers=workers)
+        start = time.perf_counter()
+        warmer.start()
+        warmer.wait()
+        result['warmup_s'] = time.perf_counter() - start
+        result['failed'] = warmer.failed
+        result['tasks'] = warmer.total
+
+    latencies = []
+    for disease, country in warmup.priority_pairs():
+        start = time.perf_counter()
+        warmup.warm_pair(disease, country)
+        latencies.append(time.perf_counter() - start)
+    result['latencies'] = latencies
+    print(json.dumps(result))
+
+
+def spawn(mode, workers):
+    env = {k: v for k, v in os.environ.items() if k not in ('TRACKER_CACHE_DIR', 'TRACKER_DB')}
+    out = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_warmup', '--child', mode, '--workers', str(workers[0])],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def describe(latencies):
+    ms = [t * 1000 for t in latencies]
+    return (f"p50 {perf.percentile(ms, 50):8.1f} ms  p99 {perf.percentile(ms, 99):8.1f} ms  "
+            f"max {max(ms):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="First-visit latency with and without cache warm-up")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--child', choices=['cold', 'warm'])
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.workers[0])
+        return
+
+    cold = spawn('cold', [1])
+    print(f"cold first visit, {len(cold['latencies'])} pairs: {describe(cold['latencies'])}")
+    for workers in args.workers:
+        warm = spawn('warm', [workers])
+        print(f"warm-up {workers} worker(s): {warm['tasks']} tasks in {warm['warmup_s']:.1f}s "
+              f"({warm['failed']} failed); first visit after: {describe(warm['latencies'])}")
+
+
+if __name__ == '__main__':
+    main()
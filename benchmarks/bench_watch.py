@@ -0,0 +1,84 @@
+"""Hot-reload benchmark.
+
+Copies data/ and content/ to a scratch directory, warms every pair, then
+rewrites one series CSV and times what the watcher does about it (poll,
+targeted invalidation, re-warming the changed pair) against dropping every
+cache and warming all pairs again.
+
+    python -m benchmarks.bench_watch --changes 1 5
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ['TRACKER_WARMUP'] = '1'
+os.environ.pop('TRACKER_CACHE_DIR', None)
+
+import tracker.data as data  # noqa: E402
+from tracker import cache, perf, warmup  # noqa: E402
+from tracker.watcher import DataWatcher  # noqa: E402
+
+
+def warm_all():
+    for disease in data.DISEASES:
+        for country in data.COUNTRIES:
+            warmup.warm_pair(disease, country)
+
+
+def cached_entries():
+    return sum(len(getattr(c, 'local', c)) for c in cache._registry)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Targeted invalidation vs full reload")
+    parser.add_argument('--changes', type=int, nargs='+', default=[1, 5])
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp()
+    try:
+        data.DATA_DIR = shutil.copytree(data.DATA_DIR, os.path.join(scratch, 'data'))
+        data.CONTENT_DIR = shutil.copytree(data.CONTENT_DIR, os.path.join(scratch, 'content'))
+        watcher = DataWatcher([data.DATA_DIR, data.CONTENT_DIR])
+        watcher.poll()
+
+        start = time.perf_counter()
+        warm_all()
+        print(f"initial warm-up of {len(data.DISEASES) * len(data.COUNTRIES)} pairs: "
+              f"{time.perf_counter() - start:.2f}s, {cached_entries()} cache entries")
+
+        start = time.perf_counter()
+        watcher.poll()
+        print(f"idle poll: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        pairs = [(d, c) for d in data.DISEASES for c in data.COUNTRIES]
+        for count in args.changes:
+            for disease, country in pairs[:count]:
+                path = data.data_path(disease, country)
+                with open(path, 'a') as f:
+                    f.write('')
+                os.utime(path, ns=(time.time_ns(), time.time_ns()))
+            before = cached_entries()
+            invalidated = perf.counters().get('watch_invalidated', 0)
+            start = time.perf_counter()
+            changed = watcher.poll()
+            elapsed = time.perf_counter() - start
+            invalidated = perf.counters().get('watch_invalidated', 0) - invalidated
+            print(f"{count} changed file(s): watcher refresh {elapsed * 1000:.0f} ms "
+                  f"({len(changed)} files, {invalidated} of {before} entries invalidated and re-warmed)")
+
+            start = time.perf_counter()
+            for c in cache._registry:
+                c.clear()
+            warm_all()
+            print(f"{'':>19}full reload      {(time.perf_counter() - start) * 1000:.0f} ms")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Parity check for batch risk scoring.
+
+Scores random people with the single-person rules, with score_batch, and
+through chunked CSV streaming, and fails if any score or level differs.
+Runs in seconds, without the throughput benchmark.
+
+    python -m benchmarks.check_risk --rows 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tracker import risk  # noqa: E402
+
+
+def random_people(n, seed=0):
+    rng = np.random.default_rng(seed)
+
+    def random_lists(options, max_items):
+        counts = rng.integers(0, max_items + 1, n)
+        return [risk.LIST_SEPARATOR.join(rng.choice(options, k, replace=False)) for k in counts]
+
+    return pd.DataFrame({
+        'age': rng.integers(0, 101, n),
+        'symptoms': random_lists(risk.SYMPTOMS, 4),
+        'pre_conditions': random_lists(risk.PRE_CONDITIONS, 3),
+        'vaccinated': rng.choice(risk.VACCINATION_STATUSES, n),
+    })
+
+
+def split(value):
+    return value.split(risk.LIST_SEPARATOR) if value else []
+
+
+def single_scores(people):
+    return [
+        risk.risk_score(age, split(symptoms), split(conditions), vaccinated)
+        for age, symptoms, conditions, vaccinated in people[risk.INPUT_COLUMNS].itertuples(index=False)
+    ]
+
+
+def mismatches(scored, expected):
+    scores = int((scored['risk_score'].to_numpy() != expected).sum())
+    levels = sum(risk.risk_level(s) != level for s, level in zip(expected, scored['risk_level']))
+    return scores, levels
+
+
+def check_parity(n, chunksize=1000):
+    people = random_people(n, seed=1)
+    expected = np.array(single_scores(people))
+    results = {'score_batch': risk.score_batch(people)}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'people.csv')
+        people.to_csv(source, index=False)
+        results['csv streaming'] = pd.concat(risk.score_csv(source, chunksize), ignore_index=True)
+    for name, scored in results.items():
+        scores, levels = mismatches(scored, expected)
+        if len(scored) != n or scores or levels:
+            raise SystemExit(f"parity check failed for {name}: {len(scored):,} rows, "
+                             f"{scores} score and {levels} level mismatches")
+    print(f"parity: {n:,} random people match the single-person rules")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch risk scoring parity check")
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--chunksize', type=int, default=1000, help="CSV chunk size, small to cross many chunks")
+    args = parser.parse_args()
+    check_parity(args.rows, args.chunksize)
+
+
+if __name__ == '__main__':
+    main()
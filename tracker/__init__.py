@@ -0,0 +1,19 @@
+from tracker.analytics import aligned_series, calculate_growth_rate, monthly_heatmap
+from tracker.chatbot import append_turn, detect_entities, generate_response, use_fallback_chatbot
+from tracker.data import (
+    CHRONIC_DISEASES,
+    COUNTRIES,
+    DISEASES,
+    cases_on,
+    data_path,
+    history_path,
+    history_tag,
+    info_path,
+    load_info,
+    load_series,
+    load_window,
+    pair_tag,
+    query_csv_data,
+    read_text,
+)
+from tracker.forecast import forecast_series, predict_future_cases
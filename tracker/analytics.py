@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from tracker import perf, resample
+from tracker.cache import shared_cache
+from tracker.data import COUNTRIES, aggregation, data_version, latest_date, load_series, load_window, pair_tags
+
+# Longest lead/lag searched, in days.
+MAX_LAG_DAYS = 90
+# Complex cross-spectrum values computed per block in cross_correlation.
+CROSS_BLOCK_SIZE = 1 << 22
+
+aligned_cache = shared_cache('aligned_cache', maxsize=128)
+lead_lag_cache = shared_cache('lead_lag_cache', maxsize=64)
+
+
+def calculate_growth_rate(data, window=7):
+    # window is in days; a time-based window stays correct for monthly and
+    # annual series where a row is not a day.
+    try:
+        data = data.sort_values('date')
+        data['rolling_avg'] = data.rolling(f'{window}D', on='date', min_periods=1)['cases'].mean()
+        data['growth_rate'] = data['rolling_avg'].pct_change() * 100
+        return data
+    except Exception:
+        return data
+
+
+def aligned_series(disease, countries, freq=None, column='cases', since=None):
+    # since limits each series to rows from that date on (plus the anchor row
+    # before it), which the SQLite store reads without loading whole series.
+    countries = tuple(countries)
+    key = (disease, countries, freq, column, since, tuple(data_version(disease, c) for c in countries))
+
+    def compute():
+        frames = {}
+        for country in countries:
+            df = load_series(disease, country) if since is None else load_window(disease, country, since)
+            if df is not None and len(df):
+                frames[country] = df
+        return resample.align(frames, freq, column, aggregation(disease))
+
+    return aligned_cache.get_or_compute(key, compute, pair_tags(disease, countries)).copy()
+
+
+@perf.timed('heatmap')
+def monthly_heatmap(disease, countries, months=12):
+    # Only the trailing months are read, with one month of margin so the
+    # first month shown is never cut short.
+    last = max((d for d in (latest_date(disease, c) for c in countries) if d is not None), default=None)
+    since = None if last is None else last.to_period('M').start_time - pd.DateOffset(months=months + 1)
+    monthly = aligned_series(disease, countries, 'MS', since=since).dropna(how='all').tail(months)
+    months_labels = [d.strftime('%Y-%m') for d in monthly.index]
+    matrix = monthly.fillna(0).T.to_numpy()
+    return matrix, months_labels, list(monthly.columns)
+
+
+def growth_matrix(aligned, step_days):
+    # Waves show up in the growth of a series, not its level. Daily data is
+    # compared on week-over-week growth of the 7-day mean, which removes the
+    # weekday reporting pattern; other frequencies on step-over-step growth.
+    values = np.log1p(aligned.dropna().clip(lower=0))
+    periods = 1
+    if step_days == 1:
+        values = values.rolling(7).mean()
+        periods = 7
+    growth = values.diff(periods).dropna()
+    std = growth.std(ddof=0).replace(0, np.nan)
+    return ((growth - growth.mean()) / std).fillna(0)
+
+
+def cross_correlation(matrix, max_lag):
+    # matrix is (time, series). Returns (2 * max_lag + 1, series, series) with
+    # out[max_lag + k, i, j] = sum_t x_i(t) * x_j(t + k) / T, all pairs and
+    # lags from one batch of FFTs.
+    length, count = matrix.shape
+    size = 1 << int(np.ceil(np.log2(2 * length - 1)))
+    spectrum = np.fft.rfft(matrix, n=size, axis=0)
+    out = np.empty((2 * max_lag + 1, count, count))
+    # Rows of the pair matrix are done in blocks so the cross-spectra of a
+    # large panel never have to fit in memory at once.
+    rows = max(1, CROSS_BLOCK_SIZE // (spectrum.shape[0] * count))
+    for start in range(0, count, rows):
+        block = np.conj(spectrum[:, start:start + rows, None]) * spectrum[:, None, :]
+        cross = np.fft.irfft(block, n=size, axis=0) / length
+        out[:max_lag, start:start + rows] = cross[size - max_lag:]
+        out[max_lag:, start:start + rows] = cross[:max_lag + 1]
+    return out
+
+
+@perf.timed('lead_lag')
+def lead_lag(disease, countries=None, freq=None, max_lag_days=MAX_LAG_DAYS):
+    # Returns (lag_days, correlation) DataFrames indexed by country on both
+    # axes; a positive lag_days.loc[a, b] means a's waves lead b's by that
+    # many days. None when fewer than two countries overlap long enough, or
+    # when one step of the series is longer than max_lag_days.
+    countries = tuple(countries or COUNTRIES)
+    key = (disease, countries, freq, max_lag_days, tuple(data_version(disease, c) for c in countries))
+
+    def compute():
+        aligned = aligned_series(disease, countries, freq).dropna(axis=1, how='all')
+        step_days = resample.FREQUENCIES[freq or resample.detect_frequency(aligned.index)]
+        if step_days > max_lag_days:
+            return None
+        growth = growth_matrix(aligned, step_days)
+        if growth.shape[1] < 2 or len(growth) < 8:
+            return None
+        max_lag = int(min(max_lag_days // step_days, len(growth) // 2))
+
+        cross = cross_correlation(growth.to_numpy(), max_lag)
+        best = cross.argmax(axis=0)
+        names = list(growth.columns)
+        lag_days = pd.DataFrame((best - max_lag) * step_days, index=names, columns=names).round().astype(int)
+        correlation = pd.DataFrame(cross.max(axis=0), index=names, columns=names)
+        return lag_days, correlation
+
+    result = lead_lag_cache.get_or_compute(key, compute, pair_tags(disease, countries))
+    if result is None:
+        return None
+    return result[0].copy(), result[1].copy()
@@ -0,0 +1,271 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from tracker import perf
+from tracker.data import COUNTRIES, DISEASES, load_series
+from tracker.resample import FREQUENCIES, resample_series
+
+SEASON_LENGTHS = {'D': 7, 'W': 52, 'MS': 12, 'QS': 4, 'YS': 1}
+DETECTOR_NAMES = ['EWMA', 'CUSUM', 'Seasonal']
+
+ACTIVE_DAYS = 31
+REFRESH_SECONDS = 30
+MAX_ALERTS = 1000
+
+
+def season_slots(dates, freq):
+    if freq == 'D':
+        return dates.dt.dayofweek.to_numpy()
+    if freq == 'W':
+        return dates.dt.isocalendar().week.to_numpy().astype(int) % 52
+    if freq == 'MS':
+        return dates.dt.month.to_numpy() - 1
+    if freq == 'QS':
+        return dates.dt.quarter.to_numpy() - 1
+    return np.zeros(len(dates), dtype=int)
+
+
+def periods(df, freq):
+    # One row per period of the series' detected frequency, so a daily tail
+    # on a monthly series is summed into months instead of advancing the
+    # monthly detectors day by day. A last period built from finer rows may
+    # still be filling up, so it is held back until the next one starts.
+    rows = resample_series(df, freq, how='mean').dropna().rename('cases').reset_index()
+    dates = df['date']
+    if len(dates) > 1 and (dates.iloc[-1] - dates.iloc[-2]).days < FREQUENCIES[freq] / 2:
+        rows = rows.iloc[:-1]
+    return rows
+
+
+class DetectorBank:
+    # Online surge detectors for many series at once. State is a handful of
+    # arrays with one entry per series (plus one per season slot), and each
+    # update() call advances every series by one observation.
+    #
+    # Values are compared on a log scale against an exponentially smoothed
+    # level + trend forecast, so steady growth is not mistaken for a surge.
+    # EWMA flags a single large residual, CUSUM a run of moderate ones, and
+    # the seasonal z-score compares against past values in the same slot
+    # (weekday, month, ...).
+    def __init__(self, size=0, season_length=12, alpha=0.3, beta=0.1, limit=3.0,
+                 cusum_k=0.5, cusum_h=5.0, seasonal_z=3.0, min_samples=12):
+        self.season_length = season_length
+        self.alpha = alpha
+        self.beta = beta
+        self.limit = limit
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.seasonal_z = seasonal_z
+        self.min_samples = min_samples
+        self.count = np.zeros(0, dtype=np.int64)
+        self.level = np.zeros(0)
+        self.trend = np.zeros(0)
+        self.var = np.zeros(0)
+        self.cusum = np.zeros(0)
+        self.season_count = np.zeros((0, season_length))
+        self.season_mean = np.zeros((0, season_length))
+        self.season_m2 = np.zeros((0, season_length))
+        self.grow(size)
+
+    def __len__(self):
+        return len(self.count)
+
+    def grow(self, size):
+        extra = size - len(self)
+        if extra <= 0:
+            return
+        self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+        self.level = np.concatenate([self.level, np.zeros(extra)])
+        self.trend = np.concatenate([self.trend, np.zeros(extra)])
+        self.var = np.concatenate([self.var, np.zeros(extra)])
+        self.cusum = np.concatenate([self.cusum, np.zeros(extra)])
+        pad = np.zeros((extra, self.season_length))
+        self.season_count = np.vstack([self.season_count, pad])
+        self.season_mean = np.vstack([self.season_mean, pad])
+        self.season_m2 = np.vstack([self.season_m2, pad])
+
+    def update(self, values, slots=None):
+        # values: one new observation per series, NaN where a series has no
+        # new row. Returns (flags, z) with flags shaped (series, detectors).
+        x = np.log1p(np.maximum(np.asarray(values, dtype=float), 0))
+        active = ~np.isnan(x)
+        x = np.where(active, x, 0.0)
+        if slots is None:
+            slots = np.zeros(len(x), dtype=int)
+        slots = np.asarray(slots, dtype=int) % self.season_length
+        rows = np.arange(len(x))
+
+        residual = x - (self.level + self.trend)
+        std = np.sqrt(self.var)
+        warmed = active & (self.count >= self.min_samples)
+        z = np.where(std > 0, residual / np.where(std > 0, std, 1), 0.0)
+
+        ewma_flag = warmed & (z > self.limit)
+
+        cusum = np.maximum(0.0, self.cusum + z - self.cusum_k)
+        cusum_flag = warmed & (cusum > self.cusum_h)
+        self.cusum = np.where(active, np.where(cusum_flag, 0.0, cusum), self.cusum)
+
+        s_count = self.season_count[rows, slots]
+        s_mean = self.season_mean[rows, slots]
+        s_std = np.sqrt(self.season_m2[rows, slots] / np.maximum(s_count - 1, 1))
+        s_z = np.where(s_std > 0, (x - s_mean) / np.where(s_std > 0, s_std, 1), 0.0)
+        seasonal_flag = active & (s_count >= max(2, self.min_samples // self.season_length)) & (s_z > self.seasonal_z)
+
+        # Holt level/trend, EWMA residual variance and Welford per-season
+        # statistics.
+        first = active & (self.count == 0)
+        second = active & (self.count == 1)
+        new_level = np.where(first, x, self.level + self.trend + self.alpha * residual)
+        new_trend = np.where(first, 0.0, np.where(second, x - self.level, self.trend + self.alpha * self.beta * residual))
+        new_var = np.where(self.count < 2, 0.0, (1 - self.alpha) * self.var + self.alpha * residual ** 2)
+        self.level = np.where(active, new_level, self.level)
+        self.trend = np.where(active, new_trend, self.trend)
+        self.var = np.where(active, new_var, self.var)
+        self.count = self.count + active
+
+        new_count = s_count + active
+        s_delta = x - s_mean
+        updated_mean = s_mean + np.where(active, s_delta / np.maximum(new_count, 1), 0.0)
+        self.season_m2[rows, slots] += np.where(active, s_delta * (x - updated_mean), 0.0)
+        self.season_mean[rows, slots] = updated_mean
+        self.season_count[rows, slots] = new_count
+
+        flags = np.column_stack([ewma_flag, cusum_flag, seasonal_flag])
+        return flags, np.maximum(z, s_z)
+
+
+class AnomalyMonitor:
+    def __init__(self, pairs=None):
+        self.pairs = pairs or [(d, c) for d in DISEASES for c in COUNTRIES]
+        self.banks = {}
+        self.index = {}
+        self.seen = {}
+        self.last_date = {}
+        self.alerts = deque(maxlen=MAX_ALERTS)
+        self.latest = {}
+        self.last_refresh = 0.0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return bool(self.seen)
+
+    def _bank_for(self, freq):
+        if freq not in self.banks:
+            self.banks[freq] = DetectorBank(season_length=SEASON_LENGTHS[freq])
+        return self.banks[freq]
+
+    @perf.timed('anomaly_refresh')
+    def refresh(self, force=False):
+        with self._lock:
+            if not force and time.monotonic() - self.last_refresh < REFRESH_SECONDS:
+                return 0
+            self.last_refresh = time.monotonic()
+
+            # Group the periods completed since the last refresh by frequency,
+            # then feed them step by step, all series of a group at once.
+            pending = {}
+            for pair in self.pairs:
+                df = load_series(*pair)
+                if df is None:
+                    continue
+                if pair in self.seen and self.last_date[pair] == df['date'].iloc[-1]:
+                    continue
+                freq = df.attrs['freq']
+                last_seen = self.seen.get(pair)
+                new_rows = periods(df, freq)
+                if last_seen is not None:
+                    new_rows = new_rows[new_rows['date'] > last_seen]
+                self.last_date[pair] = df['date'].iloc[-1]
+                if len(new_rows):
+                    pending.setdefault(freq, []).append((pair, new_rows))
+
+            processed = 0
+            for freq, items in pending.items():
+                processed += self._ingest(freq, items)
+            return processed
+
+    def _ingest(self, freq, items):
+        bank = self._bank_for(freq)
+        for pair, _ in items:
+            if pair not in self.index:
+                self.index[pair] = (freq, len(bank))
+                bank.grow(len(bank) + 1)
+
+        steps = max(len(rows) for _, rows in items)
+        values = np.full((len(bank), steps), np.nan)
+        slots = np.zeros((len(bank), steps), dtype=int)
+        for pair, rows in items:
+            i = self.index[pair][1]
+            values[i, :len(rows)] = rows['cases'].to_numpy(dtype=float)
+            slots[i, :len(rows)] = season_slots(rows['date'], freq)
+
+        by_row = {self.index[pair][1]: (pair, rows) for pair, rows in items}
+        for step in range(steps):
+            flags, z = bank.update(values[:, step], slots[:, step])
+            for i in np.flatnonzero(flags.any(axis=1)):
+                pair, rows = by_row[i]
+                alert = {
+                    'disease': pair[0],
+                    'country': pair[1],
+                    'date': rows['date'].iloc[step],
+                    'cases': int(rows['cases'].iloc[step]),
+                    'score': round(float(z[i]), 2),
+                    'detectors': [name for name, hit in zip(DETECTOR_NAMES, flags[i]) if hit],
+                }
+                self.alerts.append(alert)
+                self.latest[pair] = alert
+
+        for pair, rows in items:
+            self.seen[pair] = rows['date'].iloc[-1]
+        return int(sum(len(rows) for _, rows in items))
+
+    def active_alert(self, disease, country):
+        alert = self.latest.get((disease, country))
+        if alert and (self.last_date[(disease, country)] - alert['date']).days <= ACTIVE_DAYS:
+            return alert
+        return None
+
+    def active_alerts(self, disease=None):
+        # Reads work on snapshots: refresh() may be adding entries on another
+        # thread, and waiting for its lock would stall the page.
+        alerts = []
+        for (d, c) in self.latest.copy():
+            if disease is not None and d != disease:
+                continue
+            alert = self.active_alert(d, c)
+            if alert:
+                alerts.append(alert)
+        return sorted(alerts, key=lambda a: -a['score'])
+
+    def recent_alerts(self, limit=10, disease=None):
+        alerts = [a for a in list(self.alerts) if disease is None or a['disease'] == disease]
+        return sorted(alerts, key=lambda a: a['date'], reverse=True)[:limit]
+
+    def run(self):
+        from tracker import warmup
+
+        while True:
+            warmup.wait_for_idle()
+            try:
+                self.refresh()
+            except Exception:
+                perf.count('anomaly_error')
+            time.sleep(REFRESH_SECONDS)
+
+    def start(self):
+        # Refreshes run on a daemon thread; pages and chat answers only read
+        # the alerts.
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name='tracker-surge-monitor', daemon=True)
+                self._thread.start()
+            return self._thread
+
+
+monitor = AnomalyMonitor()
@@ -0,0 +1,322 @@
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from tracker import perf
+
+# When set, computed artifacts are also stored under this directory so every
+# replica and worker process on the host shares them.
+CACHE_DIR = os.environ.get('TRACKER_CACHE_DIR')
+# Disk entries older than this (seconds since last write or hit) are pruned,
+# as are the least recently used ones past DISK_ENTRIES_PER_SLOT x maxsize.
+DISK_MAX_AGE = float(os.environ.get('TRACKER_CACHE_MAX_AGE', str(7 * 24 * 3600)))
+DISK_ENTRIES_PER_SLOT = 8
+PRUNE_EVERY = 100
+
+_MISSING = object()
+
+# Every cache that holds data-derived entries, so a data change can be
+# invalidated everywhere at once.
+_registry = []
+
+
+class CacheBackend:
+    # Entries can carry tags (e.g. the disease/country they were computed
+    # from); invalidate() drops every entry holding any of the given tags.
+    name = 'cache'
+
+    def get(self, key, default=None):
+        raise NotImplementedError
+
+    def set(self, key, value, tags=()):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def invalidate(self, tags):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def get_or_compute(self, key, compute, tags=()):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value, tags)
+        return value
+
+
+class LRUCache(CacheBackend):
+    def __init__(self, maxsize=256, name='cache'):
+        self.maxsize = maxsize
+        self.name = name
+        self._data = OrderedDict()
+        self._tags = {}
+        self._key_tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                perf.count(f'{self.name}_hit')
+                return self._data[key]
+        perf.count(f'{self.name}_miss')
+        return default
+
+    def set(self, key, value, tags=()):
+        with self._lock:
+            self._forget(key)
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if tags:
+                self._key_tags[key] = tuple(tags)
+                for tag in tags:
+                    self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.maxsize:
+                self._forget(next(iter(self._data)))
+
+    def _forget(self, key):
+        self._data.pop(key, None)
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def delete(self, key):
+        with self._lock:
+            self._forget(key)
+
+    def invalidate(self, tags):
+        with self._lock:
+            keys = set().union(*(self._tags.get(tag, ()) for tag in tags))
+            for key in keys:
+                self._forget(key)
+        perf.count(f'{self.name}_invalidated', len(keys))
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+            self._key_tags.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache(CacheBackend):
+    # One pickle file per entry. Writes go to a temporary file that is
+    # renamed into place, so concurrent readers in other processes see
+    # either the old entry or the new one, never a partial file. A tag is a
+    # directory of empty marker files named after the entries holding it,
+    # which every process can read and invalidate.
+    #
+    # Keys carry file versions and free-form questions, so the directory is
+    # pruned every PRUNE_EVERY writes: by age, then by count, oldest first.
+    def __init__(self, directory, name='cache', max_entries=4096, max_age=DISK_MAX_AGE):
+        self.name = name
+        self.directory = os.path.join(directory, name)
+        self.tag_directory = os.path.join(self.directory, '_tags')
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._writes = 0
+        self._prune_lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def digest(self, key):
+        return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+    def path(self, key, digest=None):
+        digest = digest or self.digest(key)
+        return os.path.join(self.directory, digest[:2], digest + '.pkl')
+
+    def tag_path(self, tag):
+        return os.path.join(self.tag_directory, self.digest(tag))
+
+    def get(self, key, default=None):
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except Exception:
+            # Missing, truncated, or pickled by a replica with different
+            # library versions: all of them are just a miss.
+            perf.count(f'{self.name}_disk_miss')
+            return default
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        perf.count(f'{self.name}_disk_hit')
+        return value
+
+    def set(self, key, value, tags=()):
+        digest = self.digest(key)
+        for tag in tags:
+            tag_path = self.tag_path(tag)
+            os.makedirs(tag_path, exist_ok=True)
+            open(os.path.join(tag_path, digest), 'wb').close()
+        path = self.path(key, digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        with self._prune_lock:
+            self._writes += 1
+            due = self._writes >= PRUNE_EVERY
+            if due:
+                self._writes = 0
+        if due:
+            self.prune()
+
+    def prune(self):
+        # Returns how many entries were removed. Other processes may prune
+        # the same directory at the same time, so every step tolerates files
+        # vanishing underneath it.
+        now = time.time()
+        entries = []
+        for shard in os.listdir(self.directory):
+            shard_path = os.path.join(self.directory, shard)
+            if shard == '_tags' or not os.path.isdir(shard_path):
+                continue
+            for name in os.listdir(shard_path):
+                try:
+                    entries.append((os.stat(os.path.join(shard_path, name)).st_mtime, os.path.join(shard_path, name)))
+                except OSError:
+                    pass
+        entries.sort(reverse=True)
+        expired = [path for mtime, path in entries if now - mtime > self.max_age]
+        kept = [path for mtime, path in entries if now - mtime <= self.max_age and path.endswith('.pkl')]
+        removed = 0
+        for path in expired + kept[self.max_entries:]:
+            try:
+                os.unlink(path)
+                removed += path.endswith('.pkl')
+            except OSError:
+                pass
+
+        # Tag markers whose entry is gone. Fresh markers are left alone: set()
+        # writes them just before the entry itself.
+        try:
+            tags = os.listdir(self.tag_directory)
+        except OSError:
+            tags = []
+        for tag in tags:
+            tag_path = os.path.join(self.tag_directory, tag)
+            try:
+                digests = os.listdir(tag_path)
+            except OSError:
+                continue
+            for digest in digests:
+                marker = os.path.join(tag_path, digest)
+                try:
+                    if now - os.stat(marker).st_mtime > 60 and not os.path.exists(self.path(None, digest)):
+                        os.unlink(marker)
+                except OSError:
+                    pass
+            try:
+                os.rmdir(tag_path)
+            except OSError:
+                pass
+        perf.count(f'{self.name}_disk_evicted', removed)
+        return removed
+
+    def delete(self, key):
+        try:
+            os.unlink(self.path(key))
+        except OSError:
+            pass
+
+    def invalidate(self, tags):
+        removed = 0
+        for tag in tags:
+            tag_path = self.tag_path(tag)
+            try:
+                digests = os.listdir(tag_path)
+            except OSError:
+                continue
+            for digest in digests:
+                try:
+                    os.unlink(self.path(None, digest))
+                    removed += 1
+                except OSError:
+                    pass
+            shutil.rmtree(tag_path, ignore_errors=True)
+        perf.count(f'{self.name}_disk_invalidated', removed)
+        return removed
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+
+class TieredCache(CacheBackend):
+    # Process-local LRU in front of a shared backend.
+    def __init__(self, local, shared):
+        self.name = local.name
+        self.local = local
+        self.shared = shared
+
+    def get(self, key, default=None):
+        value = self.local.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.shared.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            # Promoted entries are untagged locally; their keys carry the
+            # file versions, so they are never served stale and just age out.
+            self.local.set(key, value)
+        return value
+
+    def set(self, key, value, tags=()):
+        self.local.set(key, value, tags)
+        self.shared.set(key, value, tags)
+
+    def delete(self, key):
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def invalidate(self, tags):
+        return self.local.invalidate(tags) + self.shared.invalidate(tags)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+
+def register(cache):
+    _registry.append(cache)
+    return cache
+
+
+def invalidate(tags):
+    # Drops the entries tagged with any of `tags` from every registered
+    # cache; returns how many were removed.
+    tags = list(tags)
+    return sum(cache.invalidate(tags) for cache in _registry)
+
+
+def shared_cache(name, maxsize=256, directory=None):
+    directory = directory or CACHE_DIR
+    local = LRUCache(maxsize=maxsize, name=name)
+    if not directory:
+        return register(local)
+    return register(TieredCache(local, DiskCache(directory, name=name, max_entries=maxsize * DISK_ENTRIES_PER_SLOT)))
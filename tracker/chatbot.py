@@ -0,0 +1,307 @@
+import re
+
+from tracker import perf
+from tracker.anomaly import monitor
+from tracker.cache import shared_cache
+from tracker.data import (
+    COUNTRIES,
+    data_version,
+    disease_tag,
+    file_version,
+    info_path,
+    load_info,
+    pair_tag,
+    query_csv_data,
+)
+
+MAX_HISTORY_MESSAGES = 200
+
+# Whole words only, so "unusual symptoms" or "cases in the outbreak" still get
+# the regular answers.
+SURGE_PATTERN = re.compile(r"\b(surges?|surging|spikes?|spiking|anomal(y|ies|ous))\b")
+
+# Answers depend only on the normalized question, the detected pair and the
+# files behind it, so identical questions (e.g. the suggestion buttons) are
+# answered once per data version.
+response_cache = shared_cache('chat_cache', maxsize=1024)
+
+DISEASE_KEYWORDS = {
+    "HIV/AIDS": ["hiv", "aids"],
+    "Diabetes": ["diabetes", "diabetic"],
+    "Tuberculosis": ["tuberculosis", "tb"],
+    "COVID-19": ["covid", "coronavirus", "covid-19", "covid19"],
+    "Colon Cancer": ["cancer", "colon cancer"],
+    "Alzheimer's": ["alzheimer", "alzheimers", "dementia"]
+}
+
+
+def detect_entities(user_question, current_disease, current_country):
+    question_lower = user_question.lower()
+    detected_disease = current_disease
+    detected_country = current_country
+
+    for disease, keywords in DISEASE_KEYWORDS.items():
+        if any(kw in question_lower for kw in keywords):
+            detected_disease = disease
+            break
+
+    for country in COUNTRIES:
+        if country.lower() in question_lower:
+            detected_country = country
+            break
+
+    return detected_disease, detected_country
+
+
+def normalize_question(user_question):
+    return ' '.join(user_question.lower().split())
+
+
+def is_surge_question(user_question):
+    return SURGE_PATTERN.search(normalize_question(user_question)) is not None
+
+
+@perf.timed('generate_response')
+def generate_response(user_question, current_disease, current_country):
+    question = normalize_question(user_question)
+    detected_disease, detected_country = detect_entities(question, current_disease, current_country)
+
+    # Alerts cover every series and change as data arrives, so they are
+    # answered from the anomaly monitor rather than the response cache.
+    if is_surge_question(question):
+        mentioned = any(kw in question for kw in DISEASE_KEYWORDS[detected_disease])
+        return surge_response(detected_disease if mentioned else None)
+    key = (
+        question, detected_disease, detected_country,
+        data_version(detected_disease, detected_country),
+        file_version(info_path(detected_disease)),
+    )
+
+    def answer():
+        disease_info = load_info(detected_disease)
+        stats = query_csv_data(detected_disease, detected_country)
+        return use_fallback_chatbot(question, current_disease, current_country, detected_disease, detected_country, stats, disease_info)
+
+    tags = [pair_tag(detected_disease, detected_country), disease_tag(detected_disease)]
+    return response_cache.get_or_compute(key, answer, tags)
+
+
+def surge_response(disease=None):
+    scope = disease or "all diseases"
+    if not monitor.ready:
+        return f"⏳ **Surge detection is still scanning the data ({scope}).** Please ask again in a moment."
+    alerts = monitor.active_alerts(disease)
+    if alerts:
+        lines = [
+            f"• **{a['disease']} in {a['country']}**: {a['cases']:,} cases on {a['date'].strftime('%B %d, %Y')} "
+            f"({', '.join(a['detectors'])}, score {a['score']:.1f})"
+            for a in alerts[:10]
+        ]
+        return f"""🚨 **Active Surge Alerts ({scope})**
+
+""" + '\n'.join(lines) + """
+
+*Flagged by EWMA, CUSUM and seasonal z-score detectors on the latest data. Alerts highlight unusual values, not confirmed outbreaks.*"""
+
+    recent = monitor.recent_alerts(limit=1, disease=disease)
+    response = f"✅ **No unusual surges right now ({scope}).**"
+    if recent:
+        a = recent[0]
+        response += f"\n\nMost recent flag: {a['disease']} in {a['country']} on {a['date'].strftime('%B %d, %Y')} ({a['cases']:,} cases)."
+    return response
+
+
+def append_turn(history, question, response, limit=MAX_HISTORY_MESSAGES):
+    history.append({"role": "user", "content": question})
+    history.append({"role": "assistant", "content": response})
+    if len(history) > limit:
+        del history[:len(history) - limit]
+    return history
+
+
+def use_fallback_chatbot(user_question, current_disease, current_country, detected_disease, detected_country, stats, disease_info):
+    question_lower = user_question.lower()
+
+    # Check for greetings - pretty straightforward
+    if any(w in question_lower for w in ['hi', 'hello', 'hey', 'hola']):
+        response = f"""👋 **Hello! I'm your AI health assistant.**
+
+I have comprehensive data about **{detected_disease}** in **{detected_country}**.
+
+**What I can help you with:**
+📊 Statistics & trends
+💊 Symptoms & signs
+🏥 Treatment options
+🛡️ Prevention strategies
+📈 Risk factors
+
+**Try asking:**
+• "How many cases are there?"
+• "What are the symptoms?"
+• "How is it treated?"
+• "How can I prevent it?"
+"""
+        if stats:
+            response += f"\n**Quick Stats:** {stats['total_cases']:,} cases, {stats['total_deaths']:,} deaths in {detected_country}"
+        return response
+
+    if any(w in question_lower for w in ['how many', 'cases', 'deaths', 'statistics', 'data', 'numbers', 'stats']):
+        if stats:
+            is_chronic = stats.get('is_chronic', False)
+
+            if is_chronic:
+                response = f"""📊 **{detected_disease} in {detected_country} - Statistics**
+
+**Overall Prevalence:**
+• Current Prevalence: {stats['latest_cases']:,} people living with {detected_disease}
+• Peak Prevalence: {stats['peak_cases']:,} people ({stats['peak_date']})
+• Total Deaths Recorded: {stats['total_deaths']:,}
+
+**Year-over-Year Change:**
+• Change from Previous Year: {stats.get('year_change', 0):+,} people ({stats.get('year_change_pct', 0):+.1f}%)
+• Trend: {stats['trend'].upper()}
+
+**Data Coverage:** {stats['data_range']}
+
+*Note: This is a chronic condition tracked by annual prevalence (people living with the disease), not daily cases.*
+"""
+            else:
+                response = f"""📊 **{detected_disease} in {detected_country} - Statistics**
+
+**Overall Impact:**
+• Total Cases: {stats['total_cases']:,}
+• Total Deaths: {stats['total_deaths']:,}
+• Mortality Rate: {stats['mortality_rate']}%
+
+**Peak Period:**
+• Highest: {stats['peak_cases']:,} daily cases
+• Date: {stats['peak_date']}
+
+**Current Situation:**
+• Latest: {stats['latest_cases']:,} cases ({stats['latest_date']})
+• 30-day avg: {stats.get('recent_avg', 0):,} cases/day
+• Trend: {stats['trend'].upper()}
+
+**Data Coverage:** {stats['data_range']}
+"""
+            return response
+        return f"❌ No data available for {detected_disease} in {detected_country}. Try selecting from the sidebar."
+
+    if any(w in question_lower for w in ['symptom', 'signs', 'feel', 'sick', 'diagnosis']):
+        if disease_info:
+            info_lower = disease_info.lower()
+            if 'symptom' in info_lower:
+                lines = disease_info.split('\n')
+                symptom_section = []
+                in_section = False
+                for line in lines:
+                    if 'symptom' in line.lower() and not in_section:
+                        in_section = True
+                        symptom_section.append(line)
+                    elif in_section:
+                        if line.strip() and (line[0].isupper() or line.startswith('•') or line.startswith('-')):
+                            symptom_section.append(line)
+                        if len(symptom_section) > 15 or (line.strip() == '' and len(symptom_section) > 5):
+                            break
+
+                if symptom_section:
+                    return f"**{detected_disease} - Symptoms**\n\n" + '\n'.join(symptom_section) + "\n\n⚠️ *If experiencing symptoms, consult a healthcare professional.*"
+
+        return f"""ℹ️ **Symptom Information**
+
+For detailed symptoms of {detected_disease}, please:
+1. Click "View Disease Info" in the sidebar
+2. Check the Dashboard tab for statistics
+3. Visit the Risk Calculator tab
+
+*Always consult healthcare professionals for medical advice.*"""
+
+    if any(w in question_lower for w in ['treat', 'cure', 'medicine', 'therapy', 'drug']):
+        if disease_info and 'treatment' in disease_info.lower():
+            lines = disease_info.split('\n')
+            treatment_section = []
+            in_section = False
+            for line in lines:
+                if 'treatment' in line.lower() and not in_section:
+                    in_section = True
+                    treatment_section.append(line)
+                elif in_section:
+                    if line.strip():
+                        treatment_section.append(line)
+                    if len(treatment_section) > 12:
+                        break
+
+            if treatment_section:
+                return f"**{detected_disease} - Treatment**\n\n" + '\n'.join(treatment_section) + "\n\n⚠️ *Treatment must be guided by qualified healthcare professionals.*"
+
+        return f"""🏥 **Treatment Information**
+
+For {detected_disease} treatment options:
+• Check "View Disease Info" in sidebar
+• Consult healthcare professionals
+• Visit local health facilities
+
+*Never self-medicate. Seek professional guidance.*"""
+
+    if any(w in question_lower for w in ['prevent', 'avoid', 'protection', 'safe', 'reduce risk']):
+        return f"""🛡️ **Prevention Strategies for {detected_disease}**
+
+**General Prevention:**
+• Maintain good hygiene
+• Regular health check-ups
+• Follow medical guidelines
+• Stay informed about risks
+
+**More Information:**
+• View Disease Info (sidebar)
+• Check Risk Calculator tab
+• Consult healthcare providers
+
+*Prevention is often more effective than treatment.*"""
+
+    if any(w in question_lower for w in ['risk', 'cause', 'why', 'susceptible', 'vulnerable']):
+        return f"""⚠️ **Risk Factors for {detected_disease}**
+
+Risk factors vary by disease. Common factors include:
+• Age and genetics
+• Lifestyle choices
+• Environmental exposure
+• Pre-existing conditions
+• Geographic location
+
+**Check your risk:**
+Go to the **Risk Calculator** tab for personalized assessment.
+
+*Understanding risk helps in prevention.*"""
+
+    if any(w in question_lower for w in ['compare', 'comparison', 'versus', 'vs', 'difference']):
+        return f"""📊 **Compare {detected_disease} Across Countries**
+
+**To compare data:**
+1. Go to **Dashboard** tab
+2. Enable **"Compare with another country"** checkbox
+3. Select second country
+4. View side-by-side statistics
+
+**Available countries:**
+India, America, Canada, China, Russia, Australia, South Korea, France, Germany, Japan
+
+*Compare trends, peaks, and mortality rates!*"""
+
+    if any(w in question_lower for w in ['thank', 'thanks', 'appreciate']):
+        return "You're welcome! 😊 Feel free to ask anything else about diseases. I'm here to help!"
+
+    if any(w in question_lower for w in ['bye', 'goodbye', 'see you', 'exit']):
+        return "Goodbye! Stay healthy and informed. Feel free to come back anytime! 👋"
+
+    return f"""🤖 **I can help you with {detected_disease} in {detected_country}!**
+
+**Try asking:**
+• 📊 "How many cases are there?"
+• 💊 "What are the symptoms?"
+• 🏥 "How is it treated?"
+• 🛡️ "How can I prevent it?"
+• ⚠️ "What are the risk factors?"
+• 📈 "Compare countries"
+
+**Quick Stats:**""" + (f"\n{stats['total_cases']:,} cases | {stats['total_deaths']:,} deaths | Trend: {stats['trend']}" if stats else "\nSelect disease/country from sidebar for data")
@@ -0,0 +1,265 @@
+import os
+
+import pandas as pd
+
+from tracker import perf
+from tracker.cache import LRUCache, register, shared_cache
+from tracker.resample import detect_frequency
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "data")
+CONTENT_DIR = os.path.join(ROOT, "content")
+
+COUNTRIES = [
+    "India", "America", "Canada",
+    "China", "Russia",
+    "Australia",
+    "South Korea", "France", "Germany", "Japan"
+]
+
+DISEASES = [
+    "HIV/AIDS", "Diabetes", "Tuberculosis",
+    "COVID-19", "Colon Cancer",
+    "Alzheimer's"
+]
+
+CHRONIC_DISEASES = ["Diabetes", "HIV/AIDS", "Alzheimer's", "Colon Cancer"]
+
+series_cache = register(LRUCache(maxsize=128, name='series_cache'))
+text_cache = register(LRUCache(maxsize=256, name='text_cache'))
+stats_cache = shared_cache('stats_cache', maxsize=256)
+
+_path_tags = None
+
+
+def disease_slug(disease):
+    return disease.lower().replace("-", "").replace("/", "_").replace(" ", "_")
+
+
+def country_slug(country):
+    return country.lower().replace(" ", "_")
+
+
+def data_path(disease, country):
+    return os.path.join(DATA_DIR, f"{disease_slug(disease)}_{country_slug(country)}.csv")
+
+
+def history_path(disease, country):
+    return os.path.join(CONTENT_DIR, "history", f"{disease_slug(disease)}_{country_slug(country)}.txt")
+
+
+def info_path(disease):
+    return os.path.join(CONTENT_DIR, "diseases", f"{disease_slug(disease)}_info.txt")
+
+
+def pair_tag(disease, country):
+    return ('pair', disease, country)
+
+
+def history_tag(disease, country):
+    # Only the history text and its audio depend on a history file.
+    return ('history', disease, country)
+
+
+def disease_tag(disease):
+    return ('disease', disease)
+
+
+def pair_tags(disease, countries):
+    return [pair_tag(disease, c) for c in countries]
+
+
+def path_tags(path):
+    # Cache tags affected by a change to `path`: a series CSV maps to its
+    # disease/country, a history file to that pair's history text, and an
+    # info file to its disease.
+    global _path_tags
+    if _path_tags is None:
+        mapping = {}
+        for disease in DISEASES:
+            mapping[os.path.normpath(info_path(disease))] = [disease_tag(disease)]
+            for country in COUNTRIES:
+                mapping[os.path.normpath(data_path(disease, country))] = [pair_tag(disease, country)]
+                mapping[os.path.normpath(history_path(disease, country))] = [history_tag(disease, country)]
+        _path_tags = mapping
+    return _path_tags.get(os.path.normpath(path), [])
+
+
+def file_version(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def data_version(disease, country):
+    return file_version(data_path(disease, country))
+
+
+def read_csv(path):
+    perf.count('file_read')
+    with perf.timer('csv_parse'):
+        df = pd.read_csv(path)
+        df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def read_text(path):
+    def read():
+        perf.count('file_read')
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    version = file_version(path)
+    if version is None:
+        return read()
+    return text_cache.get_or_compute((path, version), read, path_tags(path))
+
+
+def aggregation(disease):
+    # Chronic diseases are tracked as prevalence (a level), the rest as new
+    # cases (a flow), which decides how they combine when resampled.
+    return 'mean' if disease in CHRONIC_DISEASES else 'sum'
+
+
+def load_series(disease, country):
+    path = data_path(disease, country)
+    version = file_version(path)
+    if version is None:
+        return None
+
+    def load():
+        df = read_csv(path).sort_values('date', kind='stable').reset_index(drop=True)
+        df.attrs['freq'] = detect_frequency(df['date'])
+        return df
+
+    # Callers get their own copy so the cached frame is never mutated.
+    return series_cache.get_or_compute((path, version), load, [pair_tag(disease, country)]).copy()
+
+
+def load_info(disease):
+    path = info_path(disease)
+    if not os.path.exists(path):
+        return ""
+    try:
+        return read_text(path)
+    except Exception:
+        return ""
+
+
+@perf.timed('query_csv_data')
+def query_csv_data(disease, country):
+    key = (disease, country, data_version(disease, country))
+    analysis = stats_cache.get_or_compute(key, lambda: analyze_series(disease, country), [pair_tag(disease, country)])
+    return dict(analysis) if analysis is not None else None
+
+
+def series_store():
+    from tracker.store import get_store
+    return get_store()
+
+
+def analyze_series(disease, country):
+    try:
+        store = series_store()
+        if store is not None:
+            summary = store.summary(disease, country)
+        else:
+            df = load_series(disease, country)
+            summary = summarize_frame(df) if df is not None else None
+        if summary is None:
+            return None
+        return build_analysis(disease, summary)
+    except Exception:
+        return None
+
+
+def summarize_frame(df):
+    peak = df['cases'].idxmax()
+    return {
+        'total_cases': df['cases'].sum(),
+        'total_deaths': df['deaths'].sum(),
+        'peak_cases': df.loc[peak, 'cases'],
+        'peak_date': df.loc[peak, 'date'],
+        'first_date': df['date'].min(),
+        'last_date': df['date'].max(),
+        'recent': df.tail(30).reset_index(drop=True),
+    }
+
+
+def build_analysis(disease, summary):
+    recent = summary['recent']
+    total_cases = summary['total_cases']
+    total_deaths = summary['total_deaths']
+    is_chronic = disease in CHRONIC_DISEASES
+
+    analysis = {
+        'total_cases': int(total_cases),
+        'total_deaths': int(total_deaths),
+        'peak_cases': int(summary['peak_cases']),
+        'peak_date': summary['peak_date'].strftime('%B %d, %Y'),
+        'latest_cases': int(recent['cases'].iloc[-1]),
+        'latest_date': recent['date'].iloc[-1].strftime('%B %d, %Y'),
+        'mortality_rate': round((total_deaths / total_cases * 100) if total_cases > 0 else 0, 2),
+        'data_range': f"{summary['first_date'].strftime('%Y')} to {summary['last_date'].strftime('%Y')}",
+        'is_chronic': is_chronic
+    }
+
+    if is_chronic:
+        if len(recent) >= 2:
+            prev_value = recent['cases'].iloc[-2]
+            current_value = recent['cases'].iloc[-1]
+            year_change = current_value - prev_value
+            year_change_pct = (year_change / prev_value * 100) if prev_value > 0 else 0
+            analysis['recent_avg'] = None
+            analysis['year_change'] = int(year_change)
+            analysis['year_change_pct'] = round(year_change_pct, 1)
+            analysis['trend'] = 'increasing' if year_change > 0 else 'decreasing'
+        else:
+            analysis['recent_avg'] = None
+            analysis['year_change'] = 0
+            analysis['year_change_pct'] = 0
+            analysis['trend'] = 'stable'
+    else:
+        analysis['recent_avg'] = int(recent['cases'].mean())
+        analysis['year_change'] = None
+        analysis['year_change_pct'] = None
+        analysis['trend'] = 'increasing' if recent['cases'].iloc[-7:].mean() > recent['cases'].iloc[:7].mean() else 'decreasing'
+
+    return analysis
+
+
+def cases_on(disease, country, day):
+    store = series_store()
+    if store is not None:
+        return store.day(disease, country, day)
+    df = load_series(disease, country)
+    if df is None:
+        return None
+    match = df[df['date'].dt.date == day]
+    if match.empty:
+        return None
+    return int(match['cases'].values[0]), int(match['deaths'].values[0])
+
+
+def load_window(disease, country, since):
+    # Rows on or after `since`, plus the last row before it so coarse series
+    # still have an anchor to interpolate from.
+    store = series_store()
+    if store is not None:
+        return store.window(disease, country, since)
+    df = load_series(disease, country)
+    if df is None:
+        return None
+    before = df.index[df['date'] <= since]
+    start = before[-1] if len(before) else 0
+    return df.loc[start:].reset_index(drop=True)
+
+
+def latest_date(disease, country):
+    store = series_store()
+    if store is not None:
+        return store.last_date(disease, country)
+    df = load_series(disease, country)
+    return df['date'].iloc[-1] if df is not None else None
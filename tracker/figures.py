@@ -0,0 +1,152 @@
+import json
+
+from tracker.analytics import lead_lag, monthly_heatmap
+from tracker.cache import shared_cache
+from tracker.data import COUNTRIES, data_version, load_series, pair_tag, pair_tags
+
+# Figures are cached as Plotly JSON so any process can rebuild them without
+# redoing the aggregation.
+figure_cache = shared_cache('figure_cache', maxsize=256)
+
+
+def cached_figure_json(key, build, tags=()):
+    def render():
+        fig = build()
+        return fig.to_json() if fig is not None else None
+
+    return figure_cache.get_or_compute(key, render, tags)
+
+
+def cached_figure(key, build, tags=()):
+    import plotly.graph_objects as go
+
+    figure_json = cached_figure_json(key, build, tags)
+    if figure_json is None:
+        return None
+    return go.Figure(json.loads(figure_json))
+
+
+def heatmap_countries(country):
+    # Default selection of the Predictions tab heatmap for a given country.
+    return [country] + [c for c in ['America', 'India', 'China'] if c != country][:2]
+
+
+def heatmap_figure(disease, countries):
+    import plotly.graph_objects as go
+
+    countries = tuple(countries)
+
+    def build():
+        heatmap_matrix, months_labels, countries_list = monthly_heatmap(disease, countries)
+        if len(countries_list) < 2:
+            return None
+
+        fig = go.Figure(data=go.Heatmap(
+            z=heatmap_matrix,
+            x=months_labels,
+            y=countries_list,
+            colorscale='Reds',
+            text=heatmap_matrix,
+            texttemplate='%{text:,.0f}',
+            textfont={"size": 10},
+            hovertemplate='Country: %{y}<br>Month: %{x}<br>Cases: %{z:,.0f}<extra></extra>',
+            colorbar=dict(title="Cases")
+        ))
+        fig.update_layout(
+            title=f'{disease} Cases: Multi-Country Comparison (Last 12 Months)',
+            xaxis_title='Month',
+            yaxis_title='Country',
+            height=max(400, len(countries_list) * 80),
+            font=dict(size=12),
+            plot_bgcolor='#0f172a',
+            paper_bgcolor='#0f172a'
+        )
+        return fig
+
+    key = ('heatmap', disease, countries, tuple(data_version(disease, c) for c in countries))
+    return cached_figure(key, build, pair_tags(disease, countries))
+
+
+def lead_lag_figure(disease):
+    import plotly.graph_objects as go
+
+    def build():
+        result = lead_lag(disease)
+        if result is None:
+            return None
+        lag_days, correlation = result
+        labels = [[f"{lag:+d}d" if row != col else "" for col, lag in zip(lag_days.columns, lags)]
+                  for row, lags in zip(lag_days.index, lag_days.to_numpy())]
+
+        fig = go.Figure(data=go.Heatmap(
+            z=lag_days.to_numpy(),
+            x=list(lag_days.columns),
+            y=list(lag_days.index),
+            customdata=correlation.to_numpy(),
+            colorscale='RdBu',
+            zmid=0,
+            text=labels,
+            texttemplate='%{text}',
+            textfont={"size": 10},
+            hovertemplate='%{y} leads %{x} by %{z} days<br>Correlation: %{customdata:.2f}<extra></extra>',
+            colorbar=dict(title="Lead (days)")
+        ))
+        fig.update_layout(
+            title=f'{disease}: Lead/Lag Between Countries',
+            xaxis_title='Follower',
+            yaxis_title='Leader',
+            height=max(400, len(lag_days) * 50),
+            font=dict(size=12),
+            plot_bgcolor='#0f172a',
+            paper_bgcolor='#0f172a'
+        )
+        return fig
+
+    key = ('lead_lag', disease, tuple(data_version(disease, c) for c in COUNTRIES))
+    return cached_figure(key, build, pair_tags(disease, COUNTRIES))
+
+
+def forecast_figure(disease, country, days_ahead=90, as_json=False):
+    # Historical cases with the forecast_series prediction, as on the
+    # Predictions tab; as_json returns the cached Plotly JSON as is.
+    import plotly.graph_objects as go
+
+    from tracker.forecast import forecast_series
+
+    def build():
+        data = load_series(disease, country)
+        future_df, _ = forecast_series(disease, country, days_ahead)
+        if data is None or future_df is None:
+            return None
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=data['date'],
+            y=data['cases'],
+            name='Historical Cases',
+            line=dict(color='#1f77b4', width=2),
+            fill='tozeroy',
+            fillcolor='rgba(31, 119, 180, 0.2)'
+        ))
+        fig.add_trace(go.Scatter(
+            x=future_df['date'],
+            y=future_df['predicted_cases'],
+            name='Predicted Cases',
+            line=dict(color='#ff7f0e', width=2, dash='dash'),
+            fill='tozeroy',
+            fillcolor='rgba(255, 127, 14, 0.1)'
+        ))
+        fig.update_layout(
+            title=f'{disease} Cases: Historical + {days_ahead}-Day Forecast',
+            xaxis_title='Date',
+            yaxis_title='Daily Cases',
+            height=500,
+            hovermode='x unified',
+            showlegend=True
+        )
+        return fig
+
+    key = ('forecast', disease, country, days_ahead, data_version(disease, country))
+    if as_json:
+        return cached_figure_json(key, build, [pair_tag(disease, country)])
+    return cached_figure(key, build, [pair_tag(disease, country)])
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from tracker import perf
+from tracker.cache import shared_cache
+from tracker.data import data_version, load_series, pair_tag
+
+TRAINING_DAYS = 180
+MIN_TRAINING_POINTS = 10
+
+forecast_cache = shared_cache('forecast_cache', maxsize=256)
+
+
+@perf.timed('predict_future_cases')
+def predict_future_cases(data, days_ahead=90):
+    # scikit-learn and scipy are imported on first use to keep import of the
+    # core package cheap for workers that never forecast.
+    from scipy.ndimage import gaussian_filter1d
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import r2_score
+    from sklearn.preprocessing import PolynomialFeatures
+
+    try:
+        data = data.copy()
+        data = data.sort_values('date')
+        data['days'] = (data['date'] - data['date'].min()).dt.days
+
+        # Train on the last 180 calendar days; coarse series (monthly or
+        # annual) have too few points in that span, so use all of them.
+        cutoff = data['date'].max() - pd.Timedelta(days=TRAINING_DAYS)
+        recent_data = data[data['date'] >= cutoff]
+        if len(recent_data) < MIN_TRAINING_POINTS:
+            recent_data = data
+        X = recent_data['days'].values.reshape(-1, 1)
+        y = recent_data['cases'].values
+
+        y_log = np.log1p(y)
+
+        poly = PolynomialFeatures(degree=3)
+        X_poly = poly.fit_transform(X)
+
+        model = LinearRegression()
+        model.fit(X_poly, y_log)
+
+        last_day = recent_data['days'].max()
+        future_days = np.array(range(last_day + 1, last_day + days_ahead + 1)).reshape(-1, 1)
+        future_days_poly = poly.transform(future_days)
+        predictions_log = model.predict(future_days_poly)
+
+        predictions = np.expm1(predictions_log)
+        predictions = np.maximum(predictions, 0)
+
+        predictions = gaussian_filter1d(predictions, sigma=2)
+
+        last_date = data['date'].max()
+        future_dates = [last_date + timedelta(days=i) for i in range(1, days_ahead + 1)]
+
+        future_df = pd.DataFrame({
+            'date': future_dates,
+            'predicted_cases': predictions.astype(int)
+        })
+
+        y_pred_log = model.predict(X_poly)
+        y_pred = np.expm1(y_pred_log)
+        r2 = r2_score(y, y_pred)
+
+        confidence = max(0.70, min(0.95, r2 * 1.5))
+
+        return future_df, confidence
+    except Exception as e:
+        print(f"Prediction error: {e}")
+        return None, 0
+
+
+def forecast_series(disease, country, days_ahead=90):
+    key = (disease, country, days_ahead, data_version(disease, country))
+
+    def compute():
+        data = load_series(disease, country)
+        if data is None:
+            return None, 0
+        return predict_future_cases(data, days_ahead)
+
+    future_df, confidence = forecast_cache.get_or_compute(key, compute, [pair_tag(disease, country)])
+    return (future_df.copy() if future_df is not None else None), confidence
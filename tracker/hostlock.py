@@ -0,0 +1,42 @@
+"""One owner per host for background jobs that write shared storage.
+
+Every Streamlit replica and uvicorn worker starts the same background
+threads. Jobs whose results land somewhere all of them read (the news
+archive, the shared disk cache) only need to run in one process: the first
+to take a non-blocking fcntl lock on the job's lock file owns it until it
+exits, when the OS releases the lock and the next process to ask takes over.
+Without fcntl (Windows) every process owns every job.
+"""
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_held = {}
+_lock = threading.Lock()
+
+
+def owns(path):
+    # True if this process holds the lock on `path`, taking it if it is free.
+    if fcntl is None:
+        return True
+    path = os.path.abspath(path)
+    with _lock:
+        if path in _held:
+            return True
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handle = open(path, 'a')
+        except OSError:
+            # No shared place to coordinate in; run the job here.
+            return True
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        _held[path] = handle
+        return True
@@ -0,0 +1,66 @@
+import importlib
+import threading
+import time
+
+from tracker import perf
+
+# Modules that are only needed by forecasting, charts, TTS and news. They are
+# imported on first use, and warm_up() preloads them off the render path,
+# one module at a time between page renders.
+HEAVY_MODULES = [
+    "plotly.graph_objects",
+    "plotly.express",
+    "sklearn.linear_model",
+    "sklearn.preprocessing",
+    "sklearn.metrics",
+    "scipy.ndimage",
+    "gtts",
+    "feedparser",
+]
+
+_warm_lock = threading.Lock()
+_warm_thread = None
+
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+    def __repr__(self):
+        return f"<LazyModule {self._name!r}>"
+
+
+def _preload(modules, wait=None):
+    for name in modules:
+        if wait is not None:
+            wait()
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        perf.record('warm_import', time.perf_counter() - start)
+
+
+def _preload_when_idle(modules):
+    from tracker.warmup import wait_for_idle
+
+    _preload(modules, wait_for_idle)
+
+
+def warm_up(modules=None):
+    global _warm_thread
+    with _warm_lock:
+        if _warm_thread is None:
+            _warm_thread = threading.Thread(
+                target=_preload_when_idle,
+                args=(modules or HEAVY_MODULES,),
+                name="tracker-warm-up",
+                daemon=True,
+            )
+            _warm_thread.start()
+        return _warm_thread
+
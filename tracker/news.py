@@ -0,0 +1,371 @@
+"""Disease news: Google News RSS feeds and a local searchable archive.
+
+Feeds for every disease/country pair are ingested into SQLite on a timer.
+Articles are deduplicated by a hash of their link and of their title (the
+same story syndicated under several URLs), and indexed with FTS5, so the
+News tab pages, searches and date-filters from disk and keeps working when
+the network does not. feedparser accepts file paths as well as URLs, so
+ingestion runs the same against local fixture feeds:
+
+    python -m tracker.news ingest --fixtures path/to/feeds
+"""
+import argparse
+import calendar
+import hashlib
+import importlib.util
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+from tracker import hostlock, perf
+from tracker.cache import CACHE_DIR
+from tracker.data import COUNTRIES, DISEASES, ROOT, country_slug, disease_slug
+
+NEWS_DB = os.environ.get('TRACKER_NEWS_DB') or os.path.join(CACHE_DIR or ROOT, 'news_archive.db')
+INGEST_ENABLED = os.environ.get('TRACKER_NEWS_INGEST', '1') != '0'
+INGEST_SECONDS = float(os.environ.get('TRACKER_NEWS_INGEST_SECONDS', str(30 * 60)))
+# Held by the one process per host that runs the periodic ingest.
+INGEST_LOCK = f'{NEWS_DB}.ingest.lock'
+PAGE_SIZE = 10
+# feedparser has no network timeout of its own, so feeds are downloaded first.
+FETCH_TIMEOUT_SECONDS = 10
+
+# Date filter choices for the News tab, in days back from today.
+PERIODS = {"Any time": None, "Past day": 1, "Past week": 7, "Past month": 30, "Past year": 365}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    link_hash TEXT NOT NULL UNIQUE,
+    title_hash TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    source TEXT NOT NULL,
+    published TEXT NOT NULL,
+    fetched TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS article_pairs (
+    disease TEXT NOT NULL,
+    country TEXT NOT NULL,
+    published TEXT NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles(id),
+    PRIMARY KEY (disease, country, published, article_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS feeds (
+    disease TEXT NOT NULL,
+    country TEXT NOT NULL,
+    source TEXT NOT NULL,
+    fetched TEXT NOT NULL,
+    entries INTEGER NOT NULL,
+    added INTEGER NOT NULL,
+    PRIMARY KEY (disease, country)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, content='articles', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+END;
+"""
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def available():
+    return importlib.util.find_spec('feedparser') is not None
+
+
+def search_url(disease, country):
+    return f"https://news.google.com/search?q={disease.replace(' ', '+')}+{country.replace(' ', '+')}"
+
+
+def feed_url(disease, country):
+    return f"https://news.google.com/rss/search?q={disease.replace(' ', '+')}+{country.replace(' ', '+')}"
+
+
+def fixture_path(directory, disease, country):
+    return os.path.join(directory, f"{disease_slug(disease)}_{country_slug(country)}.xml")
+
+
+def clean_summary(summary):
+    return re.sub('<[^<]+?>', '', summary)
+
+
+def content_hash(text):
+    return hashlib.sha1(' '.join(text.lower().split()).encode('utf-8')).hexdigest()
+
+
+def iso_time(struct):
+    return datetime.fromtimestamp(calendar.timegm(struct), timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def fts_query(text):
+    # Each word becomes a quoted prefix term, so user input can never be
+    # parsed as FTS5 syntax.
+    return ' '.join('"' + word.replace('"', '""') + '"*' for word in text.split())
+
+
+def download(url, timeout=FETCH_TIMEOUT_SECONDS):
+    request = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0 (disease-tracker news ingest)'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+@perf.timed('news_fetch')
+def fetch_feed(disease, country, source=None):
+    import feedparser
+
+    perf.count('news_fetch')
+    # Local fixture files are parsed directly; URLs are downloaded with a
+    # timeout.
+    return feedparser.parse(source or download(feed_url(disease, country))).entries
+
+
+def utc_text(moment):
+    # Naive datetimes are local time; published times are stored in UTC.
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def parse_entry(entry, fetched):
+    title = (getattr(entry, 'title', '') or '').strip()
+    link = (getattr(entry, 'link', '') or '').strip()
+    if not title or not link:
+        return None
+    published = getattr(entry, 'published_parsed', None)
+    source = getattr(entry, 'source', None)
+    return {
+        'link_hash': content_hash(link),
+        'title_hash': content_hash(title),
+        'title': title,
+        'link': link,
+        'summary': clean_summary(getattr(entry, 'summary', '') or '').strip(),
+        'source': (source.get('title', '') if isinstance(source, dict) else '') or '',
+        'published': iso_time(published) if published else fetched,
+        'fetched': fetched,
+    }
+
+
+class NewsArchive:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            self.conn.executescript(SCHEMA)
+
+    @property
+    def conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, disease, country, entries, source=''):
+        # Returns how many articles were new to the archive.
+        fetched = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+        articles = [a for a in (parse_entry(e, fetched) for e in entries) if a is not None]
+        added = 0
+        with self._write_lock, self.conn as conn:
+            for article in articles:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO articles (link_hash, title_hash, title, link, summary, source, published, fetched) "
+                    "VALUES (:link_hash, :title_hash, :title, :link, :summary, :source, :published, :fetched)",
+                    article,
+                )
+                added += cursor.rowcount
+                row = conn.execute(
+                    "SELECT id, published FROM articles WHERE link_hash = ? OR title_hash = ? LIMIT 1",
+                    (article['link_hash'], article['title_hash']),
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR IGNORE INTO article_pairs VALUES (?, ?, ?, ?)",
+                    (disease, country, row['published'], row['id']),
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, ?, ?, ?)",
+                (disease, country, source, fetched, len(articles), added),
+            )
+        perf.count('news_archived', added)
+        return added
+
+    def ingest(self, disease, country, source=None):
+        entries = fetch_feed(disease, country, source)
+        return self.add(disease, country, entries, source or feed_url(disease, country))
+
+    def ingest_all(self, fixtures=None, pause=0.0):
+        added = 0
+        for disease in DISEASES:
+            for country in COUNTRIES:
+                source = fixture_path(fixtures, disease, country) if fixtures else None
+                if source is not None and not os.path.exists(source):
+                    continue
+                try:
+                    added += self.ingest(disease, country, source)
+                except Exception:
+                    perf.count('news_ingest_error')
+                time.sleep(pause)
+        return added
+
+    def last_fetched(self, disease, country):
+        row = self.conn.execute(
+            "SELECT fetched FROM feeds WHERE disease = ? AND country = ?", (disease, country)
+        ).fetchone()
+        return row['fetched'] if row else None
+
+    def _filters(self, disease, country, query, since, until):
+        where = ["p.disease = ?", "p.country = ?"]
+        params = [disease, country]
+        if since is not None:
+            where.append("p.published >= ?")
+            params.append(utc_text(since))
+        if until is not None:
+            where.append("p.published < ?")
+            params.append(utc_text(until))
+        if query.strip():
+            where.append("p.article_id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+            params.append(fts_query(query))
+        return ' AND '.join(where), params
+
+    @perf.timed('news_search')
+    def count(self, disease, country, query='', since=None, until=None):
+        clause, params = self._filters(disease, country, query, since, until)
+        return self.conn.execute(f"SELECT COUNT(*) FROM article_pairs p WHERE {clause}", params).fetchone()[0]
+
+    @perf.timed('news_search')
+    def search(self, disease, country, query='', since=None, until=None, page=1, per_page=PAGE_SIZE):
+        # One page of matching articles, newest first.
+        clause, params = self._filters(disease, country, query, since, until)
+        rows = self.conn.execute(
+            f"SELECT a.title, a.link, a.summary, a.source, a.published FROM article_pairs p "
+            f"JOIN articles a ON a.id = p.article_id WHERE {clause} "
+            f"ORDER BY p.published DESC, p.article_id DESC LIMIT ? OFFSET ?",
+            params + [per_page, (max(page, 1) - 1) * per_page],
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def get_archive():
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = NewsArchive(NEWS_DB)
+        return _archive
+
+
+class Ingester:
+    # Re-ingests every feed on a timer, and single pairs on request (a page
+    # showing a pair with nothing archived yet, or its Refresh button). Each
+    # feed waits until no page is rendering, like the cache warm-up, and
+    # pages never fetch. Only the process holding INGEST_LOCK runs the timed
+    # cycle, so replicas and API workers do not all fetch every feed.
+    def __init__(self, interval=INGEST_SECONDS):
+        self.interval = interval
+        self.periodic = False
+        self._requests = queue.Queue()
+        self._requested = set()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def request(self, disease, country):
+        with self._lock:
+            if (disease, country) in self._requested:
+                return
+            self._requested.add((disease, country))
+        self._requests.put((disease, country))
+        self._ensure_thread()
+
+    def _ingest(self, archive, pair):
+        from tracker import warmup
+
+        warmup.wait_for_idle()
+        try:
+            archive.ingest(*pair)
+        except Exception:
+            perf.count('news_ingest_error')
+        with self._lock:
+            self._requested.discard(pair)
+
+    def _serve_requests(self, archive, timeout=0.0):
+        # Waits up to `timeout` (None: indefinitely) for the first request.
+        while True:
+            try:
+                pair = self._requests.get(timeout=timeout) if timeout != 0 else self._requests.get_nowait()
+            except queue.Empty:
+                return
+            if pair is None:
+                return
+            self._ingest(archive, pair)
+            timeout = 0.0
+
+    def run(self):
+        archive = get_archive()
+        next_cycle = 0.0
+        while True:
+            if self.periodic and time.monotonic() >= next_cycle:
+                if hostlock.owns(INGEST_LOCK):
+                    for disease in DISEASES:
+                        for country in COUNTRIES:
+                            self._serve_requests(archive)
+                            self._ingest(archive, (disease, country))
+                next_cycle = time.monotonic() + self.interval
+            self._serve_requests(archive, max(next_cycle - time.monotonic(), 0.01) if self.periodic else None)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name='tracker-news-ingest', daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def start(self):
+        self.periodic = True
+        thread = self._ensure_thread()
+        # Wakes a thread that was only serving requests.
+        self._requests.put(None)
+        return thread
+
+
+ingester = Ingester()
+
+
+def start_ingest():
+    if INGEST_ENABLED and available():
+        ingester.start()
+    return ingester
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest disease news feeds into the local archive")
+    parser.add_argument('command', choices=['ingest'])
+    parser.add_argument('--db', default=NEWS_DB)
+    parser.add_argument('--fixtures', help="directory of <disease>_<country>.xml feeds to ingest instead of Google News")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    archive = NewsArchive(args.db)
+    added = archive.ingest_all(args.fixtures)
+    total = archive.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+    print(f"{added} new articles, {total} in {args.db} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+# Timings and counters live at module level so they survive Streamlit reruns
+# and are shared by every session served from this process.
+MAX_SAMPLES = 1000
+
+_lock = threading.Lock()
+_timings = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_counters = defaultdict(int)
+
+
+def record(stage, seconds):
+    with _lock:
+        _timings[stage].append(seconds)
+
+
+def count(name, n=1):
+    with _lock:
+        _counters[name] += n
+
+
+@contextmanager
+def timer(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def timed(stage=None):
+    def decorator(func):
+        name = stage or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summary():
+    with _lock:
+        samples = {stage: list(values) for stage, values in _timings.items()}
+    rows = []
+    for stage, values in sorted(samples.items()):
+        rows.append({
+            'stage': stage,
+            'calls': len(values),
+            'p50_ms': round(percentile(values, 50) * 1000, 2),
+            'p95_ms': round(percentile(values, 95) * 1000, 2),
+            'max_ms': round(max(values) * 1000, 2) if values else 0.0,
+            'total_s': round(sum(values), 3),
+        })
+    return rows
+
+
+def counters():
+    with _lock:
+        return dict(_counters)
+
+
+def snapshot():
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'stages': summary(),
+        'counters': counters(),
+    }
+
+
+def dump_json(path=None):
+    payload = json.dumps(snapshot(), indent=2)
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+    return payload
+
+
+def reset():
+    with _lock:
+        _timings.clear()
+        _counters.clear()
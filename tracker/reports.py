@@ -0,0 +1,248 @@
+"""Bulk reports for every disease/country pair.
+
+Each pair gets an HTML or Markdown report with its statistics, the forecast
+summary and the forecast chart embedded as Plotly JSON. Reports go through
+the same cached query_csv_data, forecast_series and figure functions the app
+uses, and finished reports are written into one ZIP as they arrive, with an
+index page.
+
+Inside the app they are rendered on a thread pool over its warm caches. The
+command line renders them in a process pool; its workers share the disk
+cache when TRACKER_CACHE_DIR is set.
+
+    python -m tracker.reports --format html --output reports.zip
+"""
+import argparse
+import html
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+from tracker import lazy, perf
+from tracker.data import COUNTRIES, DISEASES, country_slug, disease_slug, load_series, query_csv_data
+from tracker.resample import FREQUENCY_NAMES
+
+FORMATS = ('html', 'md')
+WORKERS = int(os.environ.get('TRACKER_REPORT_WORKERS', '0')) or os.cpu_count() or 1
+FORECAST_DAYS = 90
+
+# Start method of the command line's process pool. Its process runs no
+# background threads, so fork is safe there and workers inherit the modules
+# imported up front; spawn is the fallback where fork is unavailable.
+START_METHOD = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Imported in the parent before forking, so workers share them instead of
+# each importing them again.
+REPORT_MODULES = [
+    "plotly.graph_objects",
+    "plotly.offline",
+    "sklearn.linear_model",
+    "sklearn.preprocessing",
+    "sklearn.metrics",
+    "scipy.ndimage",
+]
+
+HTML_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>{scripts}
+<style>
+body {{ font-family: system-ui, sans-serif; max-width: 960px; margin: 2rem auto; color: #0f172a; }}
+table {{ border-collapse: collapse; margin-bottom: 1.5rem; }}
+th, td {{ border: 1px solid #cbd5e1; padding: 0.35rem 0.75rem; text-align: left; }}
+th {{ background: #f1f5f9; }}
+.meta {{ color: #64748b; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def report_name(disease, country, fmt):
+    return f"{disease_slug(disease)}_{country_slug(country)}.{fmt}"
+
+
+def all_pairs():
+    return [(d, c) for d in DISEASES for c in COUNTRIES]
+
+
+def pair_summary(disease, country, days_ahead=FORECAST_DAYS):
+    from tracker.forecast import forecast_series
+
+    stats = query_csv_data(disease, country)
+    if stats is None:
+        return None
+    data = load_series(disease, country)
+    future_df, confidence = forecast_series(disease, country, days_ahead)
+
+    rows = [
+        ("Total cases", f"{stats['total_cases']:,}"),
+        ("Total deaths", f"{stats['total_deaths']:,}"),
+        ("Mortality rate", f"{stats['mortality_rate']}%"),
+        ("Peak cases", f"{stats['peak_cases']:,} on {stats['peak_date']}"),
+        ("Latest cases", f"{stats['latest_cases']:,} on {stats['latest_date']}"),
+        ("Data range", f"{stats['data_range']} ({len(data)} {FREQUENCY_NAMES[data.attrs['freq']]} observations)"),
+        ("Trend", stats['trend']),
+    ]
+    if stats.get('recent_avg') is not None:
+        rows.append(("30-day average", f"{stats['recent_avg']:,}"))
+    if stats.get('year_change_pct') is not None:
+        rows.append(("Change on previous year", f"{stats['year_change_pct']}%"))
+
+    forecast = []
+    if future_df is not None:
+        peak = future_df['predicted_cases'].idxmax()
+        forecast = [
+            ("Avg daily cases", f"{int(future_df['predicted_cases'].mean()):,}"),
+            ("Peak forecast", f"{int(future_df.loc[peak, 'predicted_cases']):,} on "
+                              f"{future_df.loc[peak, 'date'].strftime('%B %d, %Y')}"),
+            ("Total forecast cases", f"{int(future_df['predicted_cases'].sum()):,}"),
+            ("Model accuracy", f"{confidence * 100:.1f}%"),
+        ]
+    return {'disease': disease, 'country': country, 'stats': stats, 'rows': rows, 'forecast': forecast}
+
+
+def html_table(rows):
+    cells = ''.join(f"<tr><th>{html.escape(k)}</th><td>{html.escape(str(v))}</td></tr>" for k, v in rows)
+    return f"<table>{cells}</table>"
+
+
+def md_table(rows, header=("Metric", "Value")):
+    lines = [f"| {' | '.join(header)} |", f"|{'---|' * len(header)}"]
+    lines += [f"| {' | '.join(str(v).replace('|', '/') for v in row)} |" for row in rows]
+    return '\n'.join(lines)
+
+
+def render_html(summary, figure_json, days_ahead, generated):
+    from plotly.offline import get_plotlyjs_version
+
+    title = f"{summary['disease']} in {summary['country']}"
+    body = [f"<h1>{html.escape(title)}</h1>", f"<p class=\"meta\">Generated {generated}</p>",
+            "<h2>Statistics</h2>", html_table(summary['rows'])]
+    if summary['forecast']:
+        body += [f"<h2>{days_ahead}-Day Forecast</h2>", html_table(summary['forecast'])]
+    scripts = ''
+    if figure_json:
+        # "</" inside the JSON would end the script element early.
+        figure_json = figure_json.replace('</', '<\\/')
+        scripts = f'\n<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+        body += ['<div id="chart"></div>',
+                 f'<script type="application/json" id="figure">{figure_json}</script>',
+                 "<script>const fig = JSON.parse(document.getElementById('figure').textContent);"
+                 "Plotly.newPlot('chart', fig.data, fig.layout, {responsive: true});</script>"]
+    return HTML_PAGE.format(title=html.escape(title), scripts=scripts, body='\n'.join(body))
+
+
+def render_md(summary, figure_json, days_ahead, generated):
+    parts = [f"# {summary['disease']} in {summary['country']}", f"_Generated {generated}_",
+             "## Statistics", md_table(summary['rows'])]
+    if summary['forecast']:
+        parts += [f"## {days_ahead}-Day Forecast", md_table(summary['forecast'])]
+    if figure_json:
+        parts += ["## Chart", "<details><summary>Plotly figure JSON</summary>\n\n```json\n"
+                  f"{figure_json}\n```\n\n</details>"]
+    return '\n\n'.join(parts) + '\n'
+
+
+def render_report(disease, country, fmt='html', days_ahead=FORECAST_DAYS, generated=None):
+    # Returns (file name, text, index row), or None for pairs without data.
+    from tracker.figures import forecast_figure
+
+    summary = pair_summary(disease, country, days_ahead)
+    if summary is None:
+        return None
+    figure_json = forecast_figure(disease, country, days_ahead, as_json=True)
+    generated = generated or datetime.now().strftime('%Y-%m-%d %H:%M')
+    render = render_html if fmt == 'html' else render_md
+    stats = summary['stats']
+    row = (disease, country, f"{stats['total_cases']:,}", f"{stats['latest_cases']:,}", stats['trend'])
+    return report_name(disease, country, fmt), render(summary, figure_json, days_ahead, generated), row
+
+
+def _render_task(args):
+    try:
+        return render_report(*args)
+    except Exception:
+        perf.count('report_error')
+        return None
+
+
+def index_page(rows, fmt, generated):
+    header = ("Disease", "Country", "Total cases", "Latest cases", "Trend")
+    if fmt == 'md':
+        linked = [(f"[{d}]({report_name(d, c, fmt)})", c, *rest) for d, c, *rest in rows]
+        return f"# Disease Tracker Report Pack\n\n_Generated {generated}, {len(rows)} reports_\n\n{md_table(linked, header)}\n"
+    head = ''.join(f"<th>{h}</th>" for h in header)
+    cells = ''.join(
+        f"<tr><td><a href=\"{report_name(d, c, fmt)}\">{html.escape(d)}</a></td>"
+        + ''.join(f"<td>{html.escape(v)}</td>" for v in (c, *rest)) + "</tr>"
+        for d, c, *rest in rows
+    )
+    body = (f"<h1>Disease Tracker Report Pack</h1><p class=\"meta\">Generated {generated}, {len(rows)} reports</p>"
+            f"<table><tr>{head}</tr>{cells}</table>")
+    return HTML_PAGE.format(title="Disease Tracker Report Pack", scripts='', body=body)
+
+
+def iter_reports(pairs, fmt='html', days_ahead=FORECAST_DAYS, workers=WORKERS, generated=None, processes=False):
+    # Yields render_report results in pair order as soon as each is ready.
+    # Process pools are for the command line only: forking a server that has
+    # warm-up, watcher and ingest threads running can copy a held lock.
+    generated = generated or datetime.now().strftime('%Y-%m-%d %H:%M')
+    tasks = [(d, c, fmt, days_ahead, generated) for d, c in pairs]
+    if workers <= 1:
+        yield from map(_render_task, tasks)
+        return
+    if not processes:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tracker-report') as pool:
+            yield from pool.map(_render_task, tasks)
+        return
+    if START_METHOD == 'fork':
+        lazy._preload(REPORT_MODULES)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(START_METHOD)) as pool:
+        yield from pool.map(_render_task, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+
+
+@perf.timed('report_pack')
+def write_reports(out, fmt='html', days_ahead=FORECAST_DAYS, workers=WORKERS, pairs=None, processes=False):
+    # out is a path or a writable binary file object; returns the number of
+    # reports written. processes=True renders in a process pool (command
+    # line only, see iter_reports).
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}")
+    generated = datetime.now().strftime('%Y-%m-%d %H:%M')
+    rows = []
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for result in iter_reports(pairs or all_pairs(), fmt, days_ahead, workers, generated, processes):
+            if result is None:
+                continue
+            name, text, row = result
+            archive.writestr(name, text)
+            rows.append(row)
+        archive.writestr(f'index.{fmt}', index_page(rows, fmt, generated))
+    perf.count('report_written', len(rows))
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write stats and forecast reports for every pair into one ZIP")
+    parser.add_argument('--format', choices=FORMATS, default='html')
+    parser.add_argument('--output', default='disease_reports.zip')
+    parser.add_argument('--days', type=int, default=FORECAST_DAYS, help="forecast horizon")
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = write_reports(args.output, args.format, args.days, args.workers, processes=True)
+    print(f"{written} reports in {args.output} ({time.perf_counter() - start:.1f}s, "
+          f"{args.workers} worker processes, {START_METHOD})")
+
+
+if __name__ == '__main__':
+    main()
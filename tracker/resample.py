@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+# Calendar frequencies the engine understands, finest first, with their
+# nominal length in days.
+FREQUENCIES = {
+    'D': 1.0,
+    'W': 7.0,
+    'MS': 30.44,
+    'QS': 91.31,
+    'YS': 365.25,
+}
+FREQUENCY_NAMES = {'D': 'daily', 'W': 'weekly', 'MS': 'monthly', 'QS': 'quarterly', 'YS': 'annual'}
+
+
+def detect_frequency(dates):
+    dates = pd.Series(pd.to_datetime(dates)).sort_values().drop_duplicates()
+    if len(dates) < 2:
+        return 'D'
+
+    steps = dates.diff().dt.total_seconds().to_numpy()[1:] / 86400
+    aliases = list(FREQUENCIES)
+    lengths = np.array([FREQUENCIES[a] for a in aliases])
+    nearest = np.abs(np.log(steps[:, None] / lengths[None, :])).argmin(axis=1)
+
+    # Weight each step by the time it covers, so a short daily tail does not
+    # outvote decades of monthly samples.
+    coverage = np.bincount(nearest, weights=steps, minlength=len(aliases))
+    return aliases[int(coverage.argmax())]
+
+
+def series_frequency(df):
+    freq = df.attrs.get('freq')
+    if freq is None:
+        freq = detect_frequency(df['date'])
+    return freq
+
+
+def coarsest(freqs):
+    return max(freqs, key=lambda f: FREQUENCIES[f])
+
+
+def resample_series(df, freq, column='cases', how='sum'):
+    series = df.set_index('date')[column].astype(float).sort_index()
+    series = series[~series.index.duplicated(keep='last')]
+    native = series_frequency(df)
+
+    if FREQUENCIES[freq] >= FREQUENCIES[native]:
+        bins = series.resample(freq)
+        return bins.sum(min_count=1) if how == 'sum' else bins.mean()
+
+    # Upsampling: interpolate over time onto the finer grid. Flows are
+    # rescaled so each new period carries its share of the native period.
+    grid = pd.date_range(series.index.min().to_period(freq[0]).start_time, series.index.max(), freq=freq)
+    combined = series.reindex(series.index.union(grid)).interpolate(method='time', limit_area='inside')
+    result = combined.reindex(grid)
+    if how == 'sum':
+        result = result * FREQUENCIES[freq] / FREQUENCIES[native]
+    return result
+
+
+def align(frames, freq=None, column='cases', how='sum'):
+    if not frames:
+        return pd.DataFrame()
+    if freq is None:
+        freq = coarsest(series_frequency(df) for df in frames.values())
+    aligned = pd.DataFrame({
+        name: resample_series(df, freq, column, how)
+        for name, df in frames.items()
+    })
+    aligned.index.name = 'date'
+    return aligned.sort_index()
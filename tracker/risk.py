@@ -0,0 +1,147 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from tracker import perf
+
+SYMPTOMS = ["Fever", "Cough", "Fatigue", "Difficulty Breathing",
+            "Loss of Taste/Smell", "Body Aches", "None"]
+PRE_CONDITIONS = ["Diabetes", "Heart Disease", "Lung Disease",
+                  "Obesity", "Immunocompromised", "None"]
+VACCINATION_STATUSES = ["Fully Vaccinated", "Partially Vaccinated", "Not Vaccinated"]
+
+VACCINATION_POINTS = {
+    "Fully Vaccinated": 0,
+    "Partially Vaccinated": 15,
+    "Not Vaccinated": 25,
+}
+
+# Columns expected in an uploaded patient list. Symptoms and pre-conditions
+# are ';'-separated lists, e.g. "Fever;Cough".
+INPUT_COLUMNS = ["age", "symptoms", "pre_conditions", "vaccinated"]
+LIST_SEPARATOR = ";"
+DEFAULT_CHUNKSIZE = 100_000
+
+# Scored patient lists written by the app, one per session. A file is touched
+# on every rerun that shows it, so files left behind by ended sessions are the
+# ones older than SCORED_MAX_AGE, and are swept.
+SCORED_DIR = os.path.join(tempfile.gettempdir(), "tracker_risk_scores")
+SCORED_MAX_AGE = 60 * 60
+
+
+def risk_score(age, symptoms, pre_conditions, vaccinated):
+    score = 10
+
+    if age > 60:
+        score += 30
+    elif age > 40:
+        score += 20
+    elif age > 20:
+        score += 10
+
+    score += len(symptoms) * 5
+    score += len(pre_conditions) * 10
+
+    if vaccinated == "Not Vaccinated":
+        score += 25
+    elif vaccinated == "Partially Vaccinated":
+        score += 15
+
+    return min(score, 100)
+
+
+def risk_level(score):
+    if score < 30:
+        return "Low"
+    elif score < 60:
+        return "Moderate"
+    return "High"
+
+
+def count_items(column):
+    column = column.fillna("").astype(str).str.strip()
+    counts = column.str.count(LIST_SEPARATOR) + 1
+    return counts.where(column != "", 0).to_numpy()
+
+
+@perf.timed('risk_batch')
+def score_batch(people):
+    missing = [c for c in INPUT_COLUMNS if c not in people.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    age = pd.to_numeric(people["age"], errors="coerce").to_numpy()
+    if np.isnan(age).any():
+        raise ValueError("Column 'age' must be numeric")
+
+    vaccination = people["vaccinated"].map(VACCINATION_POINTS)
+    if vaccination.isna().any():
+        unknown = sorted(people.loc[vaccination.isna(), "vaccinated"].astype(str).unique())[:5]
+        raise ValueError(f"Unknown vaccination status: {', '.join(unknown)}")
+
+    score = 10 + np.select([age > 60, age > 40, age > 20], [30, 20, 10], 0)
+    score = score + count_items(people["symptoms"]) * 5
+    score = score + count_items(people["pre_conditions"]) * 10
+    score = score + vaccination.to_numpy(dtype=np.int64)
+    score = np.minimum(score, 100).astype(np.int64)
+
+    scored = people.copy()
+    scored["risk_score"] = score
+    scored["risk_level"] = np.select([score < 30, score < 60], ["Low", "Moderate"], "High")
+    return scored
+
+
+def score_csv(source, chunksize=DEFAULT_CHUNKSIZE):
+    # Reads and scores one chunk at a time so memory stays bounded by
+    # chunksize regardless of file length. pandas' default NA strings are off,
+    # so a "None" symptom or condition counts as in the single-person rules.
+    reader = pd.read_csv(source, chunksize=chunksize, keep_default_na=False,
+                         dtype={"symptoms": str, "pre_conditions": str})
+    for chunk in reader:
+        yield score_batch(chunk)
+
+
+def score_csv_file(source, destination, chunksize=DEFAULT_CHUNKSIZE):
+    rows = 0
+    levels = {"Low": 0, "Moderate": 0, "High": 0}
+    for i, scored in enumerate(score_csv(source, chunksize)):
+        scored.to_csv(destination, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        rows += len(scored)
+        for level, n in scored["risk_level"].value_counts().items():
+            levels[level] += int(n)
+    return rows, levels
+
+
+def scored_file():
+    sweep_scored()
+    return tempfile.NamedTemporaryFile("w", suffix=".csv", dir=SCORED_DIR, delete=False)
+
+
+def keep_scored(path):
+    # Marks a scored file as in use; False if it has already been swept.
+    try:
+        os.utime(path)
+        return True
+    except OSError:
+        return False
+
+
+def remove_scored(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def sweep_scored(max_age=SCORED_MAX_AGE):
+    os.makedirs(SCORED_DIR, exist_ok=True)
+    cutoff = time.time() - max_age
+    for entry in os.scandir(SCORED_DIR):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
@@ -0,0 +1,164 @@
+"""Compartmental (SIR/SEIR) what-if scenarios.
+
+The model is fitted to the tail of the selected series: the recent growth
+rate and incidence give the effective reproduction number and the initial
+compartments. A sweep perturbs transmission and the latent/infectious periods
+and integrates every scenario at once with RK4, one array operation per
+step over all scenarios.
+"""
+import numpy as np
+import pandas as pd
+
+from tracker import perf
+from tracker.cache import shared_cache
+from tracker.data import data_version, load_series, pair_tag
+from tracker.resample import FREQUENCIES
+
+# Mid-2020s populations, used as N for the compartments.
+POPULATIONS = {
+    "India": 1_430_000_000,
+    "America": 335_000_000,
+    "Canada": 40_000_000,
+    "China": 1_410_000_000,
+    "Russia": 144_000_000,
+    "Australia": 27_000_000,
+    "South Korea": 52_000_000,
+    "France": 68_000_000,
+    "Germany": 84_000_000,
+    "Japan": 124_000_000,
+}
+
+# Per-disease model settings. Periods are in days; fit_days is how much of
+# the series tail the growth rate is estimated from and horizon counts steps
+# of the series' own frequency (days for COVID-19, years for Tuberculosis).
+SCENARIO_MODELS = {
+    "COVID-19": {
+        'model': 'seir', 'latent_days': 5.2, 'infectious_days': 7.0,
+        'fit_days': 28, 'horizon': 180, 'dt': 0.5,
+    },
+    "Tuberculosis": {
+        'model': 'seir', 'latent_days': 730.0, 'infectious_days': 365.0,
+        'fit_days': 5 * 365, 'horizon': 10, 'dt': 7.0,
+    },
+}
+
+QUANTILES = [5, 25, 50, 75, 95]
+SIMULATE_BLOCK = 4096
+
+scenario_cache = shared_cache('scenario_cache', maxsize=64)
+
+
+def fit_model(df, population, model='seir', latent_days=5.2, infectious_days=7.0, fit_days=28, **_):
+    step_days = FREQUENCIES[df.attrs.get('freq', 'D')]
+    cases = df['cases'].astype(float)
+    if step_days == 1:
+        cases = cases.rolling(7, min_periods=1).mean()
+    window = df['date'] >= df['date'].iloc[-1] - pd.Timedelta(days=fit_days)
+    if window.sum() < 3:
+        window = df.index >= len(df) - 3
+    days = (df.loc[window, 'date'] - df['date'].iloc[-1]).dt.days.to_numpy()
+    log_cases = np.log1p(cases[window].to_numpy())
+    growth = np.polyfit(days, log_cases, 1)[0] if len(days) > 1 else 0.0
+
+    gamma = 1 / infectious_days
+    sigma = 1 / latent_days if model == 'seir' else None
+    # Keep growth inside the range the model can produce.
+    growth = max(growth, -0.9 * (min(gamma, sigma) if sigma else gamma))
+    incidence = max(cases.iloc[-1] / step_days, 1.0)
+
+    removed = min(df['cases'].sum(), 0.9 * population)
+    exposed = incidence / sigma if sigma else 0.0
+    infectious = incidence / (gamma + growth)
+    susceptible = max(population - removed - exposed - infectious, 1.0)
+    r_eff = (1 + growth / gamma) * ((1 + growth / sigma) if sigma else 1)
+    return {
+        'model': model,
+        'population': population,
+        'beta': r_eff * gamma * population / susceptible,
+        'sigma': sigma,
+        'gamma': gamma,
+        'growth': growth,
+        'r_eff': r_eff,
+        'state': (susceptible, exposed, infectious, removed),
+    }
+
+
+def simulate(fit, beta, sigma, gamma, days, dt=1.0):
+    # All parameters are arrays with one entry per scenario. Returns the
+    # cumulative incidence at every whole day, shape (scenarios, days + 1).
+    beta, sigma, gamma = (np.atleast_1d(np.asarray(p, dtype=float)) for p in (beta, sigma, gamma))
+    # Blocks of scenarios keep the RK4 temporaries cache-sized.
+    return np.vstack([
+        integrate(fit, beta[i:i + SIMULATE_BLOCK], sigma[i:i + SIMULATE_BLOCK], gamma[i:i + SIMULATE_BLOCK], days, dt)
+        for i in range(0, max(beta.size, 1), SIMULATE_BLOCK)
+    ])
+
+
+def integrate(fit, beta, sigma, gamma, days, dt):
+    n = fit['population']
+    latent = fit['sigma'] is not None
+    state = np.array([np.full(beta.shape, v, dtype=float) for v in fit['state']] + [np.zeros(beta.shape)])
+
+    def deriv(y):
+        s, e, i = y[0], y[1], y[2]
+        infection = beta * s * i / n
+        if latent:
+            onset = sigma * e
+            return np.stack([-infection, infection - onset, onset - gamma * i, gamma * i, onset])
+        return np.stack([-infection, np.zeros_like(e), infection - gamma * i, gamma * i, infection])
+
+    # Steps shorter than a day are recorded daily; longer steps record every
+    # `stride` days and fill the days in between linearly.
+    substeps, stride = (int(round(1 / dt)), 1) if dt < 1 else (1, int(round(dt)))
+    cumulative = np.zeros((beta.size, days + 1))
+    for day in range(0, days, stride):
+        end = min(day + stride, days)
+        h = (end - day) / substeps
+        for _ in range(substeps):
+            k1 = deriv(state)
+            k2 = deriv(state + h / 2 * k1)
+            k3 = deriv(state + h / 2 * k2)
+            k4 = deriv(state + h * k3)
+            state = np.maximum(state + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4), 0)
+        fraction = np.arange(1, end - day + 1) / (end - day)
+        cumulative[:, day + 1:end + 1] = cumulative[:, [day]] + np.outer(state[4] - cumulative[:, day], fraction)
+    return cumulative
+
+
+def sweep(fit, transmission_change=0.0, scenarios=2000, spread=0.1, period_spread=0.15, seed=0):
+    rng = np.random.default_rng(seed)
+    beta = fit['beta'] * (1 + transmission_change) * rng.uniform(1 - spread, 1 + spread, scenarios)
+    gamma = fit['gamma'] / rng.lognormal(0, period_spread, scenarios)
+    sigma = fit['sigma'] / rng.lognormal(0, period_spread, scenarios) if fit['sigma'] else np.zeros(scenarios)
+    return beta, sigma, gamma
+
+
+@perf.timed('scenario')
+def run_scenarios(disease, country, transmission_change=0.0, scenarios=2000):
+    settings = SCENARIO_MODELS.get(disease)
+    if settings is None or country not in POPULATIONS:
+        return None
+    key = (disease, country, round(transmission_change, 4), scenarios, data_version(disease, country))
+
+    def compute():
+        df = load_series(disease, country)
+        if df is None or len(df) < 3:
+            return None
+        fit = fit_model(df, POPULATIONS[country], **settings)
+        freq = df.attrs.get('freq', 'D')
+        last = df['date'].iloc[-1]
+        dates = pd.date_range(last, periods=settings['horizon'] + 1, freq=freq)[1:]
+        offsets = (dates - last).days.to_numpy()
+
+        cumulative = simulate(fit, *sweep(fit, transmission_change, scenarios), offsets[-1], settings['dt'])
+        per_step = np.diff(cumulative[:, np.concatenate([[0], offsets])], axis=1)
+        fan = pd.DataFrame(np.percentile(per_step, QUANTILES, axis=0).T, columns=[f'p{q}' for q in QUANTILES])
+        fan.insert(0, 'date', dates)
+        params = {k: fit[k] for k in ('model', 'beta', 'sigma', 'gamma', 'growth', 'r_eff')}
+        return fan, params
+
+    result = scenario_cache.get_or_compute(key, compute, [pair_tag(disease, country)])
+    if result is None:
+        return None
+    fan, params = result
+    return fan.copy(), dict(params)
@@ -0,0 +1,210 @@
+"""SQLite storage for the disease time series.
+
+All CSVs under data/ are loaded into one table clustered on
+(disease, country, date), so point lookups, summaries and date windows (the
+Daily Case Finder, stats and the monthly heatmap) read only the rows they
+need instead of parsing whole files. The
+store is enabled by pointing TRACKER_DB at a database file; files whose
+mtime or size changed are re-imported on first access.
+
+    python -m tracker.store import --db data/tracker.db
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from tracker import perf
+from tracker.data import COUNTRIES, DATA_DIR, DISEASES, data_path, file_version, read_csv
+from tracker.resample import detect_frequency
+
+DB_PATH = os.environ.get('TRACKER_DB')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    disease TEXT NOT NULL,
+    country TEXT NOT NULL,
+    date TEXT NOT NULL,
+    cases INTEGER NOT NULL,
+    deaths INTEGER NOT NULL,
+    PRIMARY KEY (disease, country, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sources (
+    disease TEXT NOT NULL,
+    country TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    freq TEXT NOT NULL,
+    total_cases INTEGER NOT NULL,
+    total_deaths INTEGER NOT NULL,
+    peak_cases INTEGER NOT NULL,
+    peak_date TEXT NOT NULL,
+    first_date TEXT NOT NULL,
+    last_date TEXT NOT NULL,
+    PRIMARY KEY (disease, country)
+);
+"""
+
+_store = None
+_store_lock = threading.Lock()
+
+
+class SeriesStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            self.conn.executescript(SCHEMA)
+
+    @property
+    def conn(self):
+        # SQLite connections are per thread; WAL lets readers run while an
+        # import is writing.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def import_csv(self, disease, country, csv_path):
+        df = read_csv(csv_path).sort_values('date', kind='stable')
+        df = df.drop_duplicates('date', keep='last')
+        version = file_version(csv_path)
+        dates = df['date'].dt.strftime('%Y-%m-%d').tolist()
+        cases = df['cases'].astype(int).tolist()
+        deaths = df['deaths'].astype(int).tolist()
+        rows = zip([disease] * len(df), [country] * len(df), dates, cases, deaths)
+        # Whole-series aggregates are fixed until the file changes, so they
+        # are kept next to the file version instead of re-scanned per query.
+        peak = int(df['cases'].to_numpy().argmax())
+        source = (
+            disease, country, csv_path, version[0], version[1], detect_frequency(df['date']),
+            sum(cases), sum(deaths), cases[peak], dates[peak], dates[0], dates[-1],
+        )
+        with self._write_lock, self.conn as conn:
+            conn.execute("DELETE FROM series WHERE disease = ? AND country = ?", (disease, country))
+            conn.executemany("INSERT INTO series VALUES (?, ?, ?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", source)
+        perf.count('store_import')
+        return len(df)
+
+    def sync(self, disease, country):
+        path = data_path(disease, country)
+        version = file_version(path)
+        row = self.conn.execute(
+            "SELECT mtime_ns, size FROM sources WHERE disease = ? AND country = ?", (disease, country)
+        ).fetchone()
+        if version is None:
+            if row is not None:
+                with self._write_lock, self.conn as conn:
+                    conn.execute("DELETE FROM series WHERE disease = ? AND country = ?", (disease, country))
+                    conn.execute("DELETE FROM sources WHERE disease = ? AND country = ?", (disease, country))
+            return False
+        if row is None or tuple(row) != version:
+            self.import_csv(disease, country, path)
+        return True
+
+    def sync_all(self):
+        return sum(self.sync(d, c) for d in DISEASES for c in COUNTRIES)
+
+    def frequency(self, disease, country):
+        row = self.conn.execute(
+            "SELECT freq FROM sources WHERE disease = ? AND country = ?", (disease, country)
+        ).fetchone()
+        return row[0] if row else None
+
+    def last_date(self, disease, country):
+        if not self.sync(disease, country):
+            return None
+        row = self.conn.execute(
+            "SELECT last_date FROM sources WHERE disease = ? AND country = ?", (disease, country)
+        ).fetchone()
+        return pd.Timestamp(row[0]) if row else None
+
+    def _frame(self, sql, params, freq):
+        df = pd.DataFrame(self.conn.execute(sql, params).fetchall(), columns=['date', 'cases', 'deaths'])
+        df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d')
+        df.attrs['freq'] = freq
+        return df
+
+    @perf.timed('store_query')
+    def window(self, disease, country, since):
+        if not self.sync(disease, country):
+            return None
+        since = pd.Timestamp(since).strftime('%Y-%m-%d')
+        sql = """
+            SELECT date, cases, deaths FROM series
+            WHERE disease = ? AND country = ? AND date >= COALESCE(
+                (SELECT MAX(date) FROM series WHERE disease = ? AND country = ? AND date <= ?), '')
+            ORDER BY date
+        """
+        params = [disease, country, disease, country, since]
+        return self._frame(sql, params, self.frequency(disease, country))
+
+    @perf.timed('store_query')
+    def day(self, disease, country, day):
+        if not self.sync(disease, country):
+            return None
+        row = self.conn.execute(
+            "SELECT cases, deaths FROM series WHERE disease = ? AND country = ? AND date = ?",
+            (disease, country, pd.Timestamp(day).strftime('%Y-%m-%d')),
+        ).fetchone()
+        return tuple(row) if row else None
+
+    @perf.timed('store_query')
+    def summary(self, disease, country, recent_rows=30):
+        if not self.sync(disease, country):
+            return None
+        source = self.conn.execute(
+            "SELECT freq, total_cases, total_deaths, peak_cases, peak_date, first_date, last_date "
+            "FROM sources WHERE disease = ? AND country = ?", (disease, country)
+        ).fetchone()
+        recent = self._frame(
+            "SELECT * FROM (SELECT date, cases, deaths FROM series WHERE disease = ? AND country = ? "
+            "ORDER BY date DESC LIMIT ?) ORDER BY date",
+            [disease, country, recent_rows], source[0],
+        )
+        return {
+            'total_cases': source[1],
+            'total_deaths': source[2],
+            'peak_cases': source[3],
+            'peak_date': pd.Timestamp(source[4]),
+            'first_date': pd.Timestamp(source[5]),
+            'last_date': pd.Timestamp(source[6]),
+            'recent': recent,
+        }
+
+
+def get_store():
+    global _store
+    if not DB_PATH:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = SeriesStore(DB_PATH)
+        return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load data/ CSVs into the SQLite series store")
+    parser.add_argument('command', choices=['import'])
+    parser.add_argument('--db', default=DB_PATH or os.path.join(DATA_DIR, 'tracker.db'))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    store = SeriesStore(args.db)
+    pairs = store.sync_all()
+    rows = store.conn.execute("SELECT COUNT(*) FROM series").fetchone()[0]
+    print(f"{pairs} series, {rows:,} rows in {args.db} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
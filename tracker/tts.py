@@ -0,0 +1,27 @@
+import hashlib
+import importlib.util
+from io import BytesIO
+
+from tracker import perf
+from tracker.cache import shared_cache
+
+audio_cache = shared_cache('audio_cache', maxsize=64)
+
+
+def available():
+    return importlib.util.find_spec('gtts') is not None
+
+
+@perf.timed('tts')
+def synthesize(text, lang='en', tags=()):
+    key = (hashlib.sha1(text.encode('utf-8')).hexdigest(), lang)
+    return BytesIO(audio_cache.get_or_compute(key, lambda: render_audio(text, lang), tags))
+
+
+def render_audio(text, lang):
+    from gtts import gTTS
+
+    tts = gTTS(text=text, lang=lang, slow=False)
+    audio_bytes = BytesIO()
+    tts.write_to_fp(audio_bytes)
+    return audio_bytes.getvalue()
@@ -0,0 +1,226 @@
+"""Background cache warm-up.
+
+On process start every disease/country pair is precomputed in a small thread
+pool: parsed series, stats, the default forecast and its chart, the default
+heatmap, the lead/lag matrix and the info and history texts. Pairs are visited in order
+of recorded page views so the most requested ones are hot first. Everything
+runs on daemon threads, and a task is only started while no page is being
+rendered, so warm-up never competes with a rerun for the GIL.
+
+With a shared cache (TRACKER_CACHE_DIR) one process per host warms it and
+the others read the results from disk; without one, every process warms its
+own memory.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from tracker import hostlock, perf
+from tracker.cache import CACHE_DIR
+from tracker.data import (
+    COUNTRIES,
+    DISEASES,
+    history_path,
+    info_path,
+    load_series,
+    query_csv_data,
+    read_text,
+)
+
+ENABLED = os.environ.get('TRACKER_WARMUP', '1') != '0'
+WORKERS = int(os.environ.get('TRACKER_WARMUP_WORKERS', '1'))
+TRAFFIC_PATH = os.path.join(CACHE_DIR or tempfile.gettempdir(), 'tracker_traffic.json')
+WARM_LOCK = os.path.join(CACHE_DIR, 'warmup.lock') if CACHE_DIR else None
+TRAFFIC_SAVE_SECONDS = 60
+# A render that never reported its end stops holding warm-up back after this,
+# even if its thread is still alive.
+RENDER_TIMEOUT_SECONDS = 10
+
+# Matches the default of the Predictions tab slider.
+FORECAST_DAYS = 90
+
+_views = Counter()
+_views_lock = threading.Lock()
+_views_saved = 0.0
+
+# Script runs in progress, by thread. Streamlit gives every script run its own
+# thread, which exits however the run ends (error, st.stop, closed session),
+# so a run that never reached end_render() is dropped once its thread is gone.
+_renders = {}
+_idle = threading.Condition()
+IDLE_POLL_SECONDS = 0.5
+
+
+def begin_render():
+    with _idle:
+        _renders[threading.current_thread()] = time.monotonic()
+
+
+def end_render():
+    with _idle:
+        _renders.pop(threading.current_thread(), None)
+        _idle.notify_all()
+
+
+def rendering():
+    with _idle:
+        cutoff = time.monotonic() - RENDER_TIMEOUT_SECONDS
+        for thread, started in list(_renders.items()):
+            if started <= cutoff or not thread.is_alive():
+                del _renders[thread]
+        return bool(_renders)
+
+
+def wait_for_idle():
+    # Polls as well as waiting for end_render(), so runs that ended without
+    # it stop holding background work back as soon as their thread exits.
+    deadline = time.monotonic() + RENDER_TIMEOUT_SECONDS
+    with _idle:
+        while rendering() and time.monotonic() < deadline:
+            _idle.wait(IDLE_POLL_SECONDS)
+
+
+def record_view(disease, country):
+    global _views_saved
+    with _views_lock:
+        _views[f'{disease}|{country}'] += 1
+        if time.monotonic() - _views_saved < TRAFFIC_SAVE_SECONDS:
+            return
+        _views_saved = time.monotonic()
+        views = Counter(load_traffic())
+        views.update(_views)
+        _views.clear()
+    try:
+        tmp = f'{TRAFFIC_PATH}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(views, f)
+        os.replace(tmp, TRAFFIC_PATH)
+    except OSError:
+        pass
+
+
+def load_traffic():
+    try:
+        with open(TRAFFIC_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def priority_pairs():
+    # Most viewed first; pairs never seen keep sidebar order, starting with
+    # the default country.
+    views = load_traffic()
+    pairs = [(d, c) for c in COUNTRIES for d in DISEASES]
+    return sorted(pairs, key=lambda pair: -views.get(f'{pair[0]}|{pair[1]}', 0))
+
+
+def warm_pair(disease, country):
+    from tracker.figures import forecast_figure, heatmap_countries, heatmap_figure, lead_lag_figure
+    from tracker.forecast import forecast_series
+
+    if load_series(disease, country) is None:
+        return
+    query_csv_data(disease, country)
+    warm_history(disease, country)
+    if os.path.exists(info_path(disease)):
+        read_text(info_path(disease))
+    forecast_series(disease, country, FORECAST_DAYS)
+    forecast_figure(disease, country, FORECAST_DAYS)
+    heatmap_figure(disease, heatmap_countries(country))
+    lead_lag_figure(disease)
+
+
+def warm_history(disease, country):
+    if os.path.exists(history_path(disease, country)):
+        read_text(history_path(disease, country))
+
+
+def warm_surges():
+    from tracker.anomaly import monitor
+
+    monitor.refresh(force=True)
+
+
+class Warmer:
+    def __init__(self, workers=WORKERS):
+        self.workers = workers
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def tasks(self):
+        pairs = priority_pairs()
+        tasks = [('pair', warm_pair, pairs[0]), ('surges', warm_surges, ())]
+        tasks += [('pair', warm_pair, pair) for pair in pairs[1:]]
+        return tasks
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name='tracker-cache-warm-up', daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def run(self):
+        tasks = self.tasks()
+        with self._lock:
+            self.total = len(tasks)
+            self.started = time.time()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='tracker-warm') as pool:
+            for future in [pool.submit(self._run_task, *task) for task in tasks]:
+                future.result()
+        with self._lock:
+            self.finished = time.time()
+        perf.record('warm_total', self.finished - self.started)
+
+    def _run_task(self, stage, fn, args):
+        wait_for_idle()
+        start = time.perf_counter()
+        try:
+            fn(*args)
+            ok = True
+        except Exception:
+            ok = False
+        perf.record(f'warm_{stage}', time.perf_counter() - start)
+        with self._lock:
+            self.done += 1
+            self.failed += not ok
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.finished is not None
+
+    def progress(self):
+        with self._lock:
+            end = self.finished or time.time()
+            return {
+                'running': self._thread is not None and self.finished is None,
+                'done': self.done,
+                'failed': self.failed,
+                'total': self.total,
+                'elapsed_s': round(end - self.started, 2) if self.started else 0.0,
+            }
+
+
+warmer = Warmer()
+
+
+def owner():
+    # Whether this process warms the caches (see the module docstring).
+    return WARM_LOCK is None or hostlock.owns(WARM_LOCK)
+
+
+def start():
+    if ENABLED and owner():
+        warmer.start()
+    return warmer
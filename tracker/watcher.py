@@ -0,0 +1,125 @@
+"""Hot reload for data/ and content/.
+
+A daemon thread polls the watched directories (mtime and size of every file,
+a few hundred stat calls). Each changed file is mapped to the cache tags it
+feeds, so a new COVID-19 CSV for India drops only that pair's series, stats,
+forecast, figures and chat answers, and an edited history file only its text
+and audio, across every cache. Each batch of
+changes bumps a data-version counter the UI shows, and the affected pairs
+are warmed again in the background.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from tracker import cache, perf
+from tracker.data import CONTENT_DIR, DATA_DIR, path_tags
+
+ENABLED = os.environ.get('TRACKER_WATCH', '1') != '0'
+POLL_SECONDS = float(os.environ.get('TRACKER_WATCH_SECONDS', '2'))
+WATCH_DIRS = [DATA_DIR, CONTENT_DIR]
+
+
+def snapshot(directories):
+    files = {}
+    for directory in directories:
+        for root, _, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+class DataWatcher:
+    def __init__(self, directories=None, interval=POLL_SECONDS):
+        self.directories = directories or WATCH_DIRS
+        self.interval = interval
+        self.version = 0
+        self.updated = None
+        self.changes = deque(maxlen=50)
+        self._files = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def poll(self):
+        # Returns the changed paths that feed a cache; the first call only
+        # takes the baseline snapshot.
+        with perf.timer('watch_poll'):
+            files = snapshot(self.directories)
+        with self._lock:
+            previous, self._files = self._files, files
+        if previous is None:
+            return []
+
+        changed = [p for p in files.keys() | previous.keys() if files.get(p) != previous.get(p)]
+        tags = {tag for path in changed for tag in path_tags(path)}
+        if not tags:
+            return []
+
+        removed = cache.invalidate(tags)
+        now = time.time()
+        with self._lock:
+            self.version += 1
+            self.updated = now
+            for path in sorted(changed):
+                if path_tags(path):
+                    kind = 'deleted' if path not in files else 'added' if path not in previous else 'modified'
+                    self.changes.appendleft({'time': now, 'path': path, 'change': kind})
+        perf.count('watch_change', len(changed))
+        perf.count('watch_invalidated', removed)
+        self.rewarm(tags)
+        return changed
+
+    def rewarm(self, tags):
+        from tracker import warmup
+
+        # Every process drops its own entries, but with a shared cache only
+        # the warm-up owner recomputes them.
+        if not warmup.ENABLED or not warmup.owner():
+            return
+        for tag in tags:
+            warm = {'pair': warmup.warm_pair, 'history': warmup.warm_history}.get(tag[0])
+            if warm is not None:
+                warmup.wait_for_idle()
+                try:
+                    warm(*tag[1:])
+                except Exception:
+                    pass
+
+    def run(self):
+        while True:
+            try:
+                self.poll()
+            except Exception:
+                perf.count('watch_error')
+            time.sleep(self.interval)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name='tracker-data-watcher', daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def status(self):
+        with self._lock:
+            return {
+                'version': self.version,
+                'updated': self.updated,
+                'watching': self._thread is not None,
+                'changes': list(self.changes)[:10],
+            }
+
+
+watcher = DataWatcher()
+
+
+def start():
+    if ENABLED:
+        watcher.start()
+    return watcher